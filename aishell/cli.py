@@ -6,7 +6,7 @@ from rich.panel import Panel
 from rich.syntax import Syntax
 
 from aishell import __version__
-from aishell.search.web_search import perform_web_search
+from aishell.search.web_search import perform_web_search, get_browser_pool
 from aishell.shell.intelligent_shell import IntelligentShell
 from aishell.search.file_search import MacOSFileSearcher, display_results
 from aishell.llm import (
@@ -17,7 +17,13 @@ from aishell.llm import (
     Conversation,
 )
 from aishell.mcp import MCPClient, MCPMessage, NLToMCPTranslator
-from aishell.utils import get_transcript_manager, load_env_on_startup
+from aishell.utils import (
+    get_transcript_manager,
+    load_env_on_startup,
+    StreamPrinter,
+    response_renderable,
+    install_uvloop,
+)
 
 console = Console()
 
@@ -32,6 +38,9 @@ def main(ctx):
     # Load environment variables on startup
     load_env_on_startup(verbose=False)
 
+    # Faster event loop for the async commands, when available
+    install_uvloop()
+
 
 @main.command()
 @click.argument("query", nargs=-1, required=True)
@@ -40,8 +49,8 @@ def main(ctx):
     "--engine",
     "-e",
     default="hackernews",
-    type=click.Choice(["google", "duckduckgo", "hackernews"]),
-    help="Search engine to use",
+    type=click.Choice(["google", "duckduckgo", "hackernews", "all"]),
+    help="Search engine to use ('all' queries every engine concurrently)",
 )
 @click.option(
     "--show-browser",
@@ -54,10 +63,16 @@ def search(query, limit, engine, show_browser):
     query_str = " ".join(query)
     headless = not show_browser
 
+    async def run_search():
+        try:
+            await perform_web_search(
+                query_str, limit=limit, engine=engine, headless=headless
+            )
+        finally:
+            await get_browser_pool().close()
+
     # Run the async search function
-    asyncio.run(
-        perform_web_search(query_str, limit=limit, engine=engine, headless=headless)
-    )
+    asyncio.run(run_search())
 
 
 @main.command()
@@ -362,7 +377,7 @@ Please consider whether any of the available MCP tools could help with this requ
 
         if stream:
             # Streaming response
-            streamed_content = ""
+            printer = StreamPrinter(console)
             with console.status("[yellow]Thinking...[/yellow]", spinner="dots"):
                 first_chunk = True
                 async for chunk in llm.stream_query(
@@ -371,9 +386,10 @@ Please consider whether any of the available MCP tools could help with this requ
                     if first_chunk:
                         console.print()  # Clear the status
                         first_chunk = False
-                    console.print(chunk, end="")
-                    streamed_content += chunk
+                    printer.write(chunk)
+                printer.flush()
             console.print()  # Final newline
+            streamed_content = printer.text
 
             # Log streamed response to transcript
             transcript.log_interaction(
@@ -408,7 +424,7 @@ Please consider whether any of the available MCP tools could help with this requ
             else:
                 # Display response in a nice panel
                 panel = Panel(
-                    response.content,
+                    response_renderable(response.content),
                     title=f"[green]{response.provider.title()} Response[/green]",
                     subtitle=f"Model: {response.model}",
                     border_style="green",
@@ -644,7 +660,7 @@ def collate(args, temperature, max_tokens, table, db, save):
                     )
                 else:
                     panel = Panel(
-                        response.content,
+                        response_renderable(response.content),
                         title=f"[green]{name.title()} Response[/green]",
                         subtitle=f"Model: {response.model}",
                         border_style="green",
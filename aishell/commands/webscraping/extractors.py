@@ -5,14 +5,17 @@ This module provides utilities to extract structured data from web pages
 using Playwright's page object.
 """
 
-from typing import Any, Dict, List, Optional, Union
-from playwright.async_api import Page, ElementHandle
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
+
+# Only for annotations; importing Playwright costs ~30ms at CLI startup
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 
 class DataExtractor:
     """Extract structured data from web pages."""
 
-    def __init__(self, page: Page):
+    def __init__(self, page: "Page"):
         """
         Initialize the data extractor.
 
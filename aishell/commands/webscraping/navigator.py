@@ -8,15 +8,12 @@ executing action sequences and extracting data from web pages.
 import asyncio
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-from playwright.async_api import (
-    async_playwright,
-    Browser,
-    BrowserContext,
-    Page,
-    Playwright,
-    TimeoutError as PlaywrightTimeoutError
-)
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
+
+# Playwright is imported when a browser starts, so registering the command
+# doesn't add its ~30ms import to every aishell invocation
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
 
 from .actions import (
     Action,
@@ -90,10 +87,10 @@ class WebNavigator:
         self.viewport = viewport or {"width": 1920, "height": 1080}
         self.timeout = timeout
 
-        self.playwright: Optional[Playwright] = None
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
+        self.playwright: Optional["Playwright"] = None
+        self.browser: Optional["Browser"] = None
+        self.context: Optional["BrowserContext"] = None
+        self.page: Optional["Page"] = None
         self.extractor: Optional[DataExtractor] = None
 
     async def __aenter__(self):
@@ -107,6 +104,8 @@ class WebNavigator:
 
     async def start(self) -> None:
         """Start the browser and create a new page."""
+        from playwright.async_api import async_playwright
+
         self.playwright = await async_playwright().start()
 
         # Get browser launcher
@@ -159,7 +158,7 @@ class WebNavigator:
 
         Raises:
             ValueError: If action type is unknown
-            PlaywrightTimeoutError: If action times out
+            playwright.async_api.TimeoutError: If action times out
         """
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
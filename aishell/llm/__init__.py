@@ -1,6 +1,6 @@
 """LLM integration module for AIShell."""
 
-from .base import LLMProvider, LLMResponse
+from .base import LLMProvider, LLMResponse, StreamError
 from .conversation import Conversation, Message
 from .providers import (
     ClaudeLLMProvider,
@@ -13,6 +13,7 @@ from .providers import (
 __all__ = [
     "LLMProvider",
     "LLMResponse",
+    "StreamError",
     "Conversation",
     "Message",
     "ClaudeLLMProvider",
@@ -25,6 +25,19 @@ class LLMResponse:
         return self.error is not None
 
 
+class StreamError(str):
+    """A stream_query chunk reporting a failure rather than model output.
+
+    It reads as "Error: <message>" so callers that just print chunks keep
+    working; callers that need to tell the two apart check isinstance.
+    """
+
+    def __new__(cls, message: str):
+        chunk = super().__new__(cls, f"Error: {message}")
+        chunk.message = message
+        return chunk
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
@@ -94,7 +107,8 @@ class LLMProvider(ABC):
             **kwargs: Additional provider-specific parameters
 
         Yields:
-            Chunks of the response as they arrive
+            Chunks of the response as they arrive, ending with a StreamError
+            chunk if the request fails
         """
         pass
 
@@ -2,7 +2,7 @@
 
 import os
 from typing import Optional, AsyncIterator
-from ..base import LLMProvider, LLMResponse
+from ..base import LLMProvider, LLMResponse, StreamError
 
 
 class ClaudeLLMProvider(LLMProvider):
@@ -135,7 +135,7 @@ class ClaudeLLMProvider(LLMProvider):
     ) -> AsyncIterator[str]:
         """Stream a query to Claude."""
         if not self.validate_config():
-            yield f"Error: API key not configured"
+            yield StreamError("API key not configured")
             return
         
         try:
@@ -155,4 +155,4 @@ class ClaudeLLMProvider(LLMProvider):
                     yield text
                     
         except Exception as e:
-            yield f"Error: Claude API error: {str(e)}"
\ No newline at end of file
+            yield StreamError(f"Claude API error: {str(e)}")
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 import os
 from typing import Optional, AsyncIterator
-from ..base import LLMProvider, LLMResponse
+from ..base import LLMProvider, LLMResponse, StreamError
 
 
 class GeminiLLMProvider(LLMProvider):
@@ -218,7 +218,7 @@ class GeminiLLMProvider(LLMProvider):
     ) -> AsyncIterator[str]:
         """Stream a query to Gemini."""
         if not self.validate_config():
-            yield f"Error: API key not configured"
+            yield StreamError("API key not configured")
             return
 
         try:
@@ -248,4 +248,4 @@ class GeminiLLMProvider(LLMProvider):
                     yield chunk.text
 
         except Exception as e:
-            yield f"Error: Gemini API error: {str(e)}"
+            yield StreamError(f"Gemini API error: {str(e)}")
@@ -2,9 +2,8 @@
 
 import os
 import json
-import aiohttp
 from typing import Optional, AsyncIterator, Dict, Any
-from ..base import LLMProvider, LLMResponse
+from ..base import LLMProvider, LLMResponse, StreamError
 
 
 class OllamaLLMProvider(LLMProvider):
@@ -39,6 +38,8 @@ class OllamaLLMProvider(LLMProvider):
     
     async def _check_model_exists(self, model: str) -> bool:
         """Check if a model exists in Ollama."""
+        import aiohttp
+
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(f"{self.base_url}/api/tags") as response:
@@ -60,6 +61,9 @@ class OllamaLLMProvider(LLMProvider):
         **kwargs
     ) -> LLMResponse:
         """Send a query to Ollama."""
+        # aiohttp takes ~100ms to import, so only pay for it when querying
+        import aiohttp
+
         model = model or self.default_model
         
         try:
@@ -178,12 +182,14 @@ class OllamaLLMProvider(LLMProvider):
         **kwargs
     ) -> AsyncIterator[str]:
         """Stream a query to Ollama."""
+        import aiohttp
+
         model = model or self.default_model
         
         try:
             # Check if model exists
             if not await self._check_model_exists(model):
-                yield f"Error: Model '{model}' not found. Pull it with: ollama pull {model}"
+                yield StreamError(f"Model '{model}' not found. Pull it with: ollama pull {model}")
                 return
             
             data = {
@@ -209,7 +215,7 @@ class OllamaLLMProvider(LLMProvider):
                 ) as response:
                     if response.status != 200:
                         error_text = await response.text()
-                        yield f"Error: Ollama API error: {error_text}"
+                        yield StreamError(f"Ollama API error: {error_text}")
                         return
                     
                     async for line in response.content:
@@ -222,6 +228,6 @@ class OllamaLLMProvider(LLMProvider):
                                 continue
                                 
         except aiohttp.ClientError as e:
-            yield f"Error: Connection error: {str(e)}. Is Ollama running?"
+            yield StreamError(f"Connection error: {str(e)}. Is Ollama running?")
         except Exception as e:
-            yield f"Error: {str(e)}"
\ No newline at end of file
+            yield StreamError(str(e))
\ No newline at end of file
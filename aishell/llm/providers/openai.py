@@ -2,7 +2,7 @@
 
 import os
 from typing import Optional, AsyncIterator, List, TYPE_CHECKING
-from ..base import LLMProvider, LLMResponse
+from ..base import LLMProvider, LLMResponse, StreamError
 
 if TYPE_CHECKING:
     from ..conversation import Message
@@ -146,7 +146,7 @@ class OpenAILLMProvider(LLMProvider):
     ) -> AsyncIterator[str]:
         """Stream a query to OpenAI."""
         if not self.validate_config():
-            yield f"Error: API key not configured"
+            yield StreamError("API key not configured")
             return
 
         try:
@@ -172,7 +172,7 @@ class OpenAILLMProvider(LLMProvider):
                     yield chunk.choices[0].delta.content
 
         except Exception as e:
-            yield f"Error: OpenAI API error: {str(e)}"
+            yield StreamError(f"OpenAI API error: {str(e)}")
 
     async def chat(
         self,
@@ -2,7 +2,7 @@
 
 import os
 from typing import Optional, AsyncIterator, Dict, Any
-from ..base import LLMProvider, LLMResponse
+from ..base import LLMProvider, LLMResponse, StreamError
 
 
 class OpenRouterLLMProvider(LLMProvider):
@@ -169,7 +169,7 @@ class OpenRouterLLMProvider(LLMProvider):
     ) -> AsyncIterator[str]:
         """Stream a query to OpenRouter."""
         if not self.validate_config():
-            yield f"Error: API key not configured"
+            yield StreamError("API key not configured")
             return
         
         try:
@@ -195,4 +195,4 @@ class OpenRouterLLMProvider(LLMProvider):
                     yield chunk.choices[0].delta.content
                     
         except Exception as e:
-            yield f"Error: OpenRouter API error: {str(e)}"
\ No newline at end of file
+            yield StreamError(f"OpenRouter API error: {str(e)}")
\ No newline at end of file
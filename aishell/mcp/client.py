@@ -2,14 +2,16 @@
 
 import json
 import asyncio
-import aiohttp
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, TYPE_CHECKING
 from dataclasses import dataclass, asdict
 from enum import Enum
 from rich.console import Console
-from rich.syntax import Syntax
 from rich.panel import Panel
 
+# aiohttp and rich.syntax are imported on first use to keep startup fast
+if TYPE_CHECKING:
+    import aiohttp
+
 
 console = Console()
 
@@ -100,13 +102,19 @@ class MCPClient:
             timeout: Request timeout in seconds
         """
         self.server_url = server_url.rstrip('/')
-        self.timeout = aiohttp.ClientTimeout(total=timeout)
-        self._session: Optional[aiohttp.ClientSession] = None
+        self.timeout = timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
         self._request_id = 0
     
+    def _new_session(self) -> "aiohttp.ClientSession":
+        """Create an HTTP session with the configured timeout."""
+        import aiohttp
+
+        return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+
     async def __aenter__(self):
         """Async context manager entry."""
-        self._session = aiohttp.ClientSession(timeout=self.timeout)
+        self._session = self._new_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -128,8 +136,10 @@ class MCPClient:
         Returns:
             MCP response from the server
         """
+        import aiohttp
+
         if not self._session:
-            self._session = aiohttp.ClientSession(timeout=self.timeout)
+            self._session = self._new_session()
         
         # Add ID if not present
         if message.id is None:
@@ -318,6 +328,8 @@ class MCPClient:
         else:
             # Format the result based on its type
             if isinstance(response.result, (dict, list)):
+                from rich.syntax import Syntax
+
                 syntax = Syntax(
                     json.dumps(response.result, indent=2),
                     "json",
@@ -1,9 +1,13 @@
 import os
 import re
+import select
+import stat
 import subprocess
 import shlex
+import tempfile
+import time
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Set, Tuple
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterator
 from datetime import datetime
 
 from rich.console import Console
@@ -15,6 +19,9 @@ from rich.tree import Tree
 
 console = Console()
 
+# Entries the find fallback never reports or descends into
+_FIND_EXCLUDES = frozenset({'.git', '__pycache__', 'node_modules', '.DS_Store', '.venv'})
+
 
 class MacOSFileSearcher:
     """macOS-optimized file system search using native tools."""
@@ -101,8 +108,8 @@ class MacOSFileSearcher:
             if type_queries:
                 query_parts.extend(type_queries)
         
-        # Build mdfind command
-        cmd = ['mdfind']
+        # Build mdfind command (-0: NUL-separated paths)
+        cmd = ['mdfind', '-0']
         
         # Add directory scope
         if path != ".":
@@ -132,6 +139,14 @@ class MacOSFileSearcher:
         """Use BSD find command for search."""
         cmd = ['find', str(Path(path).resolve())]
         
+        # Prune excluded directories so find never descends into them
+        cmd.append('(')
+        for i, exclude in enumerate(sorted(_FIND_EXCLUDES)):
+            if i:
+                cmd.append('-o')
+            cmd.extend(['-name', exclude])
+        cmd.extend([')', '-prune', '-o'])
+        
         # File name pattern
         if pattern != "*":
             if ignore_case:
@@ -159,10 +174,8 @@ class MacOSFileSearcher:
             date_args = self._parse_date_for_find(date_filter)
             cmd.extend(date_args)
         
-        # Exclude common directories
-        excludes = ['.git', '__pycache__', 'node_modules', '.DS_Store']
-        for exclude in excludes:
-            cmd.extend(['!', '-path', f'*/{exclude}/*'])
+        # NUL-separated output survives newlines in file names
+        cmd.append('-print0')
         
         return self._execute_search_command(cmd, max_results, content_pattern)
     
@@ -183,60 +196,29 @@ class MacOSFileSearcher:
             ) as progress:
                 task = progress.add_task("Searching with native tools...", total=None)
                 
-                process = subprocess.run(
+                with tempfile.TemporaryFile() as stderr_file, subprocess.Popen(
                     cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30  # Prevent hanging
-                )
-                
-                if process.returncode != 0:
-                    console.print(f"[red]Search command failed: {process.stderr}[/red]")
-                    return results
-                
-                lines = process.stdout.strip().split('\n')
-                
-                for i, line in enumerate(lines):
-                    if i >= max_results:
-                        break
-                    
-                    if not line:
-                        continue
-                    
-                    file_path = Path(line)
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file
+                ) as process:
+                    try:
+                        results, stopped_early = self._process_search_output(
+                            process, progress, task, max_results, content_pattern
+                        )
+                    except BaseException:
+                        process.kill()
+                        raise
                     
-                    # Update progress
-                    progress.update(task, description=f"Processing: {file_path.name}")
+                    # Stop the producer once we have enough results
+                    if stopped_early:
+                        process.kill()
+                    process.wait()
                     
-                    try:
-                        if not file_path.exists():
-                            continue
-                        
-                        stat = file_path.stat()
-                        
-                        # Content search with grep if needed
-                        matches = []
-                        if content_pattern and file_path.is_file():
-                            matches = self._grep_content(file_path, content_pattern)
-                        
-                        result = {
-                            'path': str(file_path),
-                            'name': file_path.name,
-                            'size': stat.st_size,
-                            'modified': datetime.fromtimestamp(stat.st_mtime),
-                            'is_dir': file_path.is_dir(),
-                            'matches': matches
-                        }
-                        
-                        # Get additional macOS metadata
-                        if self.is_macos:
-                            result.update(self._get_macos_metadata(file_path))
-                        
-                        results.append(result)
-                        
-                    except Exception as e:
-                        # Skip problematic files
-                        continue
+                    if not stopped_early and process.returncode != 0:
+                        stderr_file.seek(0)
+                        stderr = os.fsdecode(stderr_file.read())
+                        console.print(f"[red]Search command failed: {stderr}[/red]")
+                        return []
                         
         except subprocess.TimeoutExpired:
             console.print("[red]Search timed out[/red]")
@@ -245,6 +227,102 @@ class MacOSFileSearcher:
         
         return results
     
+    def _iter_output_paths(
+        self,
+        process: subprocess.Popen,
+        timeout: float = 30
+    ) -> Iterator[str]:
+        """Yield NUL-separated paths from a search command as they arrive.
+        
+        Raises subprocess.TimeoutExpired once ``timeout`` seconds in total
+        have been spent waiting on the command. Time the caller spends on
+        each path between reads doesn't count.
+        """
+        fd = process.stdout.fileno()
+        buffer = b''
+        waited = 0.0
+        while True:
+            remaining = timeout - waited
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            started = time.monotonic()
+            ready, _, _ = select.select([fd], [], [], remaining)
+            chunk = os.read(fd, 65536) if ready else None
+            waited += time.monotonic() - started
+            if chunk is None:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            if not chunk:
+                break
+            *paths, buffer = (buffer + chunk).split(b'\0')
+            for path in paths:
+                if path:
+                    yield os.fsdecode(path)
+        if buffer:
+            yield os.fsdecode(buffer)
+    
+    def _process_search_output(
+        self,
+        process: subprocess.Popen,
+        progress: Progress,
+        task,
+        max_results: int,
+        content_pattern: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Turn streamed search command output into result dicts.
+        
+        Returns the results and whether output was left unread, because
+        ``max_results`` was reached or the command timed out. Results
+        collected before a timeout are kept.
+        """
+        results = []
+        
+        try:
+            for i, line in enumerate(self._iter_output_paths(process)):
+                if i >= max_results:
+                    return results, True
+            
+                # Keep paths as plain strings: building a Path per line is
+                # measurable when mdfind/find return thousands of entries
+                name = line[line.rfind('/') + 1:]
+            
+                # Update progress
+                progress.update(task, description=f"Processing: {name}")
+            
+                try:
+                    # A single stat() answers exists/is_dir/is_file
+                    st = os.stat(line)
+                    is_dir = stat.S_ISDIR(st.st_mode)
+                
+                    # Content search with grep if needed
+                    matches = []
+                    if content_pattern and stat.S_ISREG(st.st_mode):
+                        matches = self._grep_content(line, content_pattern)
+                
+                    result = {
+                        'path': line,
+                        'name': name,
+                        'size': st.st_size,
+                        'modified': datetime.fromtimestamp(st.st_mtime),
+                        'is_dir': is_dir,
+                        'matches': matches
+                    }
+                
+                    # Get additional macOS metadata
+                    if self.is_macos:
+                        result.update(self._get_macos_metadata(line))
+                
+                    results.append(result)
+                
+                except Exception:
+                    # Skip problematic files
+                    continue
+        except subprocess.TimeoutExpired:
+            # Keep what the command produced before it stalled
+            console.print("[red]Search timed out[/red]")
+            return results, True
+        
+        return results, False
+    
     def _build_type_query(self, file_type: str) -> List[str]:
         """Build Spotlight queries for file types."""
         type_mappings = {
@@ -309,11 +387,11 @@ class MacOSFileSearcher:
             except ValueError:
                 return []
     
-    def _grep_content(self, file_path: Path, pattern: str) -> List[Tuple[int, str]]:
+    def _grep_content(self, file_path: str, pattern: str) -> List[Tuple[int, str]]:
         """Use grep to search file content."""
         matches = []
         try:
-            cmd = ['grep', '-n', '-i', pattern, str(file_path)]
+            cmd = ['grep', '-n', '-i', pattern, file_path]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
             
             if result.returncode == 0:
@@ -329,14 +407,14 @@ class MacOSFileSearcher:
         
         return matches
     
-    def _get_macos_metadata(self, file_path: Path) -> Dict[str, Any]:
+    def _get_macos_metadata(self, file_path: str) -> Dict[str, Any]:
         """Get additional macOS metadata using mdls."""
         metadata = {}
         try:
             cmd = ['mdls', '-name', 'kMDItemContentType', 
                    '-name', 'kMDItemKind', 
                    '-name', 'kMDItemLastUsedDate',
-                   str(file_path)]
+                   file_path]
             
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=3)
             
@@ -366,22 +444,29 @@ class MacOSFileSearcher:
 
         # Use -name flag to search by filename only (avoids hanging on plain text queries)
         # Result limiting is handled by _execute_search_command
-        cmd = ['mdfind', '-name', query]
+        cmd = ['mdfind', '-0', '-name', query]
         return self._execute_search_command(cmd, max_results)
 
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def format_size(size: int) -> str:
     """Format file size in human-readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f"{size:.1f} {unit}"
-        size /= 1024.0
-    return f"{size:.1f} PB"
+    if size < 1024:
+        return f"{size:.1f} B"
+    # Each unit step is 2**10, so the bit length picks the unit directly
+    idx = min((int(size).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
 
 
-def format_date(date: datetime) -> str:
-    """Format date in relative or absolute format."""
-    now = datetime.now()
+def format_date(date: datetime, now: Optional[datetime] = None) -> str:
+    """Format date in relative or absolute format.
+
+    Pass ``now`` when formatting many rows so the clock is read once.
+    """
+    if now is None:
+        now = datetime.now()
     diff = now - date
     
     if diff.days == 0:
@@ -409,11 +494,12 @@ def display_results(results: List[Dict[str, Any]], show_content: bool = True):
     table.add_column("Size", style="green", width=10)
     table.add_column("Modified", style="blue", width=20)
     
+    now = datetime.now()
     for result in results[:50]:  # Show first 50 in table
         table.add_row(
             result['path'],
             format_size(result['size']),
-            format_date(result['modified'])
+            format_date(result['modified'], now)
         )
     
     console.print(table)
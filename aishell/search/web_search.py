@@ -1,169 +1,459 @@
 import asyncio
-from typing import List, Dict, Any
-from urllib.parse import quote_plus
+import atexit
+import json
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import quote_plus, urlsplit
 
-from playwright.async_api import async_playwright, Page
-from bs4 import BeautifulSoup
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
 
-# Try to import stealth mode (optional, for bypassing bot detection)
-try:
-    from playwright_stealth import Stealth
-    STEALTH_AVAILABLE = True
-except ImportError:
-    STEALTH_AVAILABLE = False
-    Stealth = None
+# Playwright, playwright_stealth and lxml are imported on first use: together
+# they add ~100ms to startup for every aishell command, searching or not
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Browser, BrowserContext
 
 console = Console()
 
+_stealth_class = None
+_stealth_checked = False
 
-class WebSearcher:
-    def __init__(self, headless: bool = True):
-        self.headless = headless
-        self.browser = None
-        self.context = None
-        self.playwright = None
-    
-    async def __aenter__(self):
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
-        self.context = await self.browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+
+def _get_stealth():
+    """Return the playwright_stealth Stealth class, or None if not installed.
+
+    Stealth mode is optional and helps bypass moderate bot detection.
+    """
+    global _stealth_class, _stealth_checked
+    if not _stealth_checked:
+        _stealth_checked = True
+        try:
+            from playwright_stealth import Stealth
+            _stealth_class = Stealth
+        except ImportError:
+            _stealth_class = None
+    return _stealth_class
+
+
+# Runs inside the page and returns up to `limit` results as plain objects, so
+# the SERP never has to be serialized and reparsed in Python. Each selector
+# list is tried in order and the first match wins.
+_EXTRACT_RESULTS_JS = """([spec, limit]) => {
+  const first = (root, sels) => {
+    for (const sel of sels) {
+      const el = root.querySelector(sel);
+      if (el) return el;
+    }
+    return null;
+  };
+  const out = [];
+  for (const item of document.querySelectorAll(spec.item)) {
+    if (out.length >= limit) break;
+    try {
+      const titleEl = first(item, spec.title);
+      const linkEl = first(item, spec.link);
+      const snippetEl = first(item, spec.snippet);
+      const title = titleEl ? titleEl.textContent : spec.no_title;
+      const url = linkEl ? linkEl.href : "";
+      const snippet = snippetEl ? snippetEl.textContent : spec.no_snippet;
+      if (title && url) out.push({title, url, snippet});
+    } catch (e) {
+      // Skip problematic results
+    }
+  }
+  return out;
+}"""
+
+GOOGLE_SELECTORS = {
+    "item": "div.g",
+    "title": ["h3"],
+    "link": ["a"],
+    "snippet": ['div[data-sncf="1"]', "span.aCOpRe"],
+    "no_title": "No title",
+    "no_snippet": "No description available",
+}
+
+DUCKDUCKGO_SELECTORS = {
+    "item": 'article[data-testid="result"]',
+    "title": ["h2"],
+    "link": ['a[data-testid="result-title-a"]'],
+    "snippet": ['div[data-result="snippet"]', "span.result__snippet"],
+    "no_title": "No title",
+    "no_snippet": "No description available",
+}
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Nothing we extract depends on these, and they make up most of a SERP's bytes
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+BLOCKED_DOMAINS = (
+    "doubleclick.net",
+    "google-analytics.com",
+    "googletagmanager.com",
+)
+
+
+def _is_blocked_request(resource_type: str, url: str) -> bool:
+    """Check whether a request can be dropped without affecting extraction."""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlsplit(url).hostname or ""
+    return any(
+        host == domain or host.endswith("." + domain)
+        for domain in BLOCKED_DOMAINS
+    )
+
+
+async def _route_request(route):
+    """Abort heavy and tracking requests, let everything else through."""
+    request = route.request
+    if _is_blocked_request(request.resource_type, request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """Shared Playwright driver and Chromium browsers.
+
+    Launching Chromium dominates search latency, so it happens once and is
+    shared. Each WebSearcher gets a fresh context from the pool, which is
+    cheap and keeps cookies and storage from leaking between searches.
+    Playwright objects belong to the event loop that created them, so call
+    ``close()`` before that loop finishes.
+    """
+
+    def __init__(self):
+        self._lock: Optional[asyncio.Lock] = None
+        self._playwright = None
+        self._browsers: Dict[bool, "Browser"] = {}
+
+    async def _get_browser(self, headless: bool) -> "Browser":
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            browser = self._browsers.get(headless)
+            if browser is None or not browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+
+                    self._playwright = await async_playwright().start()
+                browser = await self._playwright.chromium.launch(
+                    headless=headless
+                )
+                self._browsers[headless] = browser
+            return browser
+
+    async def acquire(self, headless: bool = True) -> "BrowserContext":
+        """Create a new context on the shared browser."""
+        browser = await self._get_browser(headless)
+        context = await browser.new_context(user_agent=USER_AGENT)
 
         # Apply stealth mode if available (helps bypass moderate bot detection)
         # Tested: Works on Wikipedia and MDN (successfully bypasses moderate detection)
         # Limitation: Cannot bypass Google's aggressive detection (and shouldn't try)
-        if STEALTH_AVAILABLE and Stealth:
+        Stealth = _get_stealth()
+        if Stealth:
             stealth = Stealth()
-            await stealth.apply_stealth_async(self.context)
+            await stealth.apply_stealth_async(context)
             console.print("[dim]Stealth mode enabled[/dim]")
 
+        # Skip images, fonts, stylesheets and trackers
+        await context.route("**/*", _route_request)
+
+        return context
+
+    async def release(self, context: "BrowserContext"):
+        """Close a context and its pages; the browser stays up."""
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        """Close all browsers and stop Playwright."""
+        for browser in self._browsers.values():
+            await browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+        self._playwright = None
+        self._browsers = {}
+        self._lock = None
+
+
+_browser_pool = BrowserPool()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool."""
+    return _browser_pool
+
+
+# (engine, query, limit) -> (time stored, results)
+_CacheKey = Tuple[str, str, int]
+_CacheEntry = Tuple[float, List[Dict[str, Any]]]
+
+
+class SearchResultCache:
+    """LRU cache of search results with a TTL, optionally persisted as JSON.
+
+    Users tend to re-run the same query while iterating, and each miss costs
+    a full browser navigation. Persisting lets separate CLI runs share hits.
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        ttl: float = 300.0,
+        max_entries: int = 256,
+    ):
+        self.cache_file = Path(cache_file).expanduser() if cache_file else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[_CacheKey, _CacheEntry]" = OrderedDict()
+        self._loaded = False
+        self._save_registered = False
+
+    def _load(self):
+        """Read persisted entries on first use, dropping expired ones."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            now = time.time()
+            for engine, query, limit, stamp, results in json.loads(
+                self.cache_file.read_text(encoding="utf-8")
+            ):
+                if now - stamp < self.ttl:
+                    self._entries[(engine, query, limit)] = (stamp, results)
+        except (OSError, ValueError, TypeError):
+            # A corrupt cache is just a cold cache
+            self._entries.clear()
+
+    def get(
+        self, engine: str, query: str, limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of cached results, or None on a miss."""
+        self._load()
+        key = (engine, query, limit)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stamp, results = entry
+        if time.time() - stamp >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return [dict(result) for result in results]
+
+    def put(
+        self,
+        engine: str,
+        query: str,
+        limit: int,
+        results: List[Dict[str, Any]],
+    ):
+        """Store results, evicting the least recently used entries."""
+        self._load()
+        key = (engine, query, limit)
+        self._entries[key] = (time.time(), list(map(dict, results)))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        if self.cache_file is not None and not self._save_registered:
+            self._save_registered = True
+            atexit.register(self.save)
+
+    def save(self):
+        """Write unexpired entries to the cache file."""
+        if self.cache_file is None:
+            return
+        now = time.time()
+        data = [
+            [*key, stamp, results]
+            for key, (stamp, results) in self._entries.items()
+            if now - stamp < self.ttl
+        ]
+        try:
+            self.cache_file.write_text(json.dumps(data), encoding="utf-8")
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_search_cache() -> SearchResultCache:
+    """Get the process-wide search result cache.
+
+    Results stay in memory unless AISHELL_SEARCH_CACHE_FILE names a file to
+    persist them to, since queries can be sensitive.
+    """
+    return SearchResultCache(os.environ.get("AISHELL_SEARCH_CACHE_FILE") or None)
+
+
+class WebSearcher:
+    def __init__(
+        self,
+        headless: bool = True,
+        cache: Optional[SearchResultCache] = None,
+        pool_size: int = 4,
+    ):
+        self.headless = headless
+        self.context = None
+        self.cache = cache if cache is not None else get_search_cache()
+        # Pages are reset and reused between searches; at most pool_size are
+        # open at once, which also bounds concurrent searches
+        self.pool_size = pool_size
+        self._idle_pages: List["Page"] = []
+        self._page_slots: Optional[asyncio.Semaphore] = None
+    
+    async def __aenter__(self):
+        self.context = await get_browser_pool().acquire(self.headless)
+        self._page_slots = asyncio.Semaphore(self.pool_size)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Closing the context closes its pages too
+        self._idle_pages.clear()
         if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+            await get_browser_pool().release(self.context)
+            self.context = None
+
+    async def _acquire_page(self) -> "Page":
+        """Borrow an idle page, opening a new one if none is free."""
+        await self._page_slots.acquire()
+        if self._idle_pages:
+            return self._idle_pages.pop()
+        try:
+            return await self.context.new_page()
+        except BaseException:
+            self._page_slots.release()
+            raise
+
+    async def _release_page(self, page: "Page"):
+        """Reset a page and return it to the pool."""
+        try:
+            await page.goto("about:blank")
+            self._idle_pages.append(page)
+        except Exception:
+            await self._close_page(page)
+        finally:
+            self._page_slots.release()
+
+    async def _close_page(self, page: "Page"):
+        try:
+            await page.close()
+        except Exception:
+            pass
     
+    async def _extract_results(
+        self, page: "Page", selectors: Dict[str, Any], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Extract results in the page instead of reparsing serialized HTML."""
+        return await page.evaluate(_EXTRACT_RESULTS_JS, [selectors, limit])
+
+    async def _cached_search(
+        self, engine: str, query: str, limit: int, search
+    ) -> List[Dict[str, Any]]:
+        """Serve a search from the result cache, running it on a miss."""
+        results = self.cache.get(engine, query, limit)
+        if results is None:
+            results = await search(query, limit)
+            # Empty results usually mean a blocked or failed page; skip them
+            if results:
+                self.cache.put(engine, query, limit, results)
+        return results
+
     async def search_google(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search Google and return results."""
-        page = await self.context.new_page()
+        return await self._cached_search(
+            "google", query, limit, self._search_google
+        )
+
+    async def search_duckduckgo(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search DuckDuckGo and return results."""
+        return await self._cached_search(
+            "duckduckgo", query, limit, self._search_duckduckgo
+        )
+
+    async def search_hackernews(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search Hacker News and return results."""
+        return await self._cached_search(
+            "hackernews", query, limit, self._search_hackernews
+        )
+
+    async def _search_google(
+        self, query: str, limit: int
+    ) -> List[Dict[str, Any]]:
+        """Search Google and return results."""
+        page = await self._acquire_page()
         results = []
         
         try:
             # Navigate to Google
             search_url = f"https://www.google.com/search?q={quote_plus(query)}"
-            await page.goto(search_url, wait_until="networkidle")
+            await page.goto(search_url, wait_until="domcontentloaded")
             
-            # Wait for search results
+            # Wait for search results (the real readiness signal; trackers
+            # keep the network busy long after results render)
             await page.wait_for_selector("div#search", timeout=10000)
             
-            # Get page content
-            content = await page.content()
-            soup = BeautifulSoup(content, 'lxml')
-            
-            # Find search result containers
-            search_results = soup.find_all('div', class_='g')
-            
-            for result in search_results[:limit]:
-                try:
-                    # Extract title
-                    title_elem = result.find('h3')
-                    title = title_elem.text if title_elem else "No title"
-                    
-                    # Extract URL
-                    link_elem = result.find('a')
-                    url = link_elem.get('href', '') if link_elem else ""
-                    
-                    # Extract snippet
-                    snippet_elem = result.find('div', attrs={'data-sncf': '1'})
-                    if not snippet_elem:
-                        # Try alternative snippet location
-                        snippet_elem = result.find('span', class_='aCOpRe')
-                    snippet = snippet_elem.text if snippet_elem else "No description available"
-                    
-                    if title and url:
-                        results.append({
-                            'title': title,
-                            'url': url,
-                            'snippet': snippet
-                        })
-                except Exception as e:
-                    # Skip problematic results
-                    continue
+            results = await self._extract_results(
+                page, GOOGLE_SELECTORS, limit
+            )
             
         except Exception as e:
             console.print(f"[red]Error during search: {str(e)}[/red]")
         finally:
-            await page.close()
+            await self._release_page(page)
         
         return results
     
-    async def search_duckduckgo(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def _search_duckduckgo(
+        self, query: str, limit: int
+    ) -> List[Dict[str, Any]]:
         """Search DuckDuckGo and return results."""
-        page = await self.context.new_page()
+        page = await self._acquire_page()
         results = []
         
         try:
             # Navigate to DuckDuckGo
             search_url = f"https://duckduckgo.com/?q={quote_plus(query)}"
-            await page.goto(search_url, wait_until="networkidle")
+            await page.goto(search_url, wait_until="domcontentloaded")
             
-            # Wait for search results
+            # Wait for search results (the real readiness signal; trackers
+            # keep the network busy long after results render)
             await page.wait_for_selector("div.results", timeout=10000)
             
-            # Get page content
-            content = await page.content()
-            soup = BeautifulSoup(content, 'lxml')
-            
-            # Find search result containers
-            search_results = soup.find_all('article', attrs={'data-testid': 'result'})
-            
-            for result in search_results[:limit]:
-                try:
-                    # Extract title
-                    title_elem = result.find('h2')
-                    title = title_elem.text if title_elem else "No title"
-                    
-                    # Extract URL
-                    link_elem = result.find('a', attrs={'data-testid': 'result-title-a'})
-                    url = link_elem.get('href', '') if link_elem else ""
-                    
-                    # Extract snippet
-                    snippet_elem = result.find('div', attrs={'data-result': 'snippet'})
-                    if not snippet_elem:
-                        snippet_elem = result.find('span', class_='result__snippet')
-                    snippet = snippet_elem.text if snippet_elem else "No description available"
-                    
-                    if title and url:
-                        results.append({
-                            'title': title,
-                            'url': url,
-                            'snippet': snippet
-                        })
-                except Exception as e:
-                    # Skip problematic results
-                    continue
+            results = await self._extract_results(
+                page, DUCKDUCKGO_SELECTORS, limit
+            )
             
         except Exception as e:
             console.print(f"[red]Error during search: {str(e)}[/red]")
         finally:
-            await page.close()
+            await self._release_page(page)
 
         return results
 
-    async def search_hackernews(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def _search_hackernews(
+        self, query: str, limit: int
+    ) -> List[Dict[str, Any]]:
         """Search Hacker News and return results.
 
         Uses Algolia interface which doesn't have strict bot detection like Google.
         """
-        page = await self.context.new_page()
+        page = await self._acquire_page()
         results = []
 
         try:
@@ -173,49 +463,101 @@ class WebSearcher:
 
             # Get page content
             content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-
-            # Find story containers in Algolia interface
-            # Each story has class 'Story_container' with title and metadata divs inside
-            story_containers = soup.find_all('div', class_='Story_container')
-
-            for story in story_containers[:limit]:
-                try:
-                    # Extract title and URL from Story_title div
-                    title_div = story.find('div', class_='Story_title')
-                    if not title_div:
-                        continue
-
-                    link_elem = title_div.find('a')
-                    if not link_elem:
-                        continue
-
-                    title = link_elem.get_text(strip=True)
-                    url = link_elem.get('href', '')
-
-                    # Extract metadata from Story_meta div
-                    meta_div = story.find('div', class_='Story_meta')
-                    snippet = ""
-                    if meta_div:
-                        snippet = meta_div.get_text(strip=True)
-
-                    if title and url:
-                        results.append({
-                            'title': title,
-                            'url': url,
-                            'snippet': snippet
-                        })
-                except Exception as e:
-                    # Skip problematic results
-                    continue
+
+            results = _parse_hackernews(content, limit)
 
         except Exception as e:
             console.print(f"[red]Error during Hacker News search: {str(e)}[/red]")
         finally:
-            await page.close()
+            await self._release_page(page)
 
         return results
 
+    async def search_all(
+        self, query: str, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Search every engine concurrently and merge the results.
+
+        Each engine gets its own page in the shared context, so total latency
+        is that of the slowest engine rather than the sum. Results keep
+        engine order (Google, DuckDuckGo, Hacker News) with duplicate URLs
+        dropped.
+        """
+        engine_results = await asyncio.gather(
+            self.search_google(query, limit),
+            self.search_duckduckgo(query, limit),
+            self.search_hackernews(query, limit),
+            return_exceptions=True,
+        )
+
+        results = []
+        seen_urls = set()
+        for batch in engine_results:
+            if isinstance(batch, BaseException):
+                console.print(f"[red]Error during search: {str(batch)}[/red]")
+                continue
+            for result in batch:
+                if result['url'] not in seen_urls:
+                    seen_urls.add(result['url'])
+                    results.append(result)
+        return results
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements whose class list contains ``name``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Story containers in the Algolia interface, capped at $limit in the query so
+# libxml2 stops collecting once it has enough
+_HN_STORIES_XPATH = (
+    f"(//div[{_has_class('Story_container')}])[position() <= $limit]"
+)
+_HN_LINK_XPATH = f".//div[{_has_class('Story_title')}]//a"
+_HN_META_XPATH = f".//div[{_has_class('Story_meta')}]"
+
+
+def _parse_hackernews(content: str, limit: int) -> List[Dict[str, Any]]:
+    """Extract stories from a Hacker News (Algolia) results page.
+
+    Parses with lxml directly and selects with XPath, so the tree walking
+    happens in libxml2 rather than in Python.
+    """
+    import lxml.html
+
+    results = []
+    tree = lxml.html.fromstring(content)
+
+    # Each story is a 'Story_container' with title and metadata divs inside
+    for story in tree.xpath(_HN_STORIES_XPATH, limit=limit):
+        try:
+            # Extract title and URL from the Story_title link
+            links = story.xpath(_HN_LINK_XPATH)
+            if not links:
+                continue
+
+            link_elem = links[0]
+            title = link_elem.text_content().strip()
+            url = link_elem.get('href', '')
+
+            # Extract metadata from Story_meta div
+            meta = story.xpath(_HN_META_XPATH)
+            snippet = ""
+            if meta:
+                snippet = "".join(text.strip() for text in meta[0].itertext())
+
+            if title and url:
+                results.append({
+                    'title': title,
+                    'url': url,
+                    'snippet': snippet
+                })
+        except Exception:
+            # Skip problematic results
+            continue
+
+    return results
+
 
 def display_results(results: List[Dict[str, Any]], query: str):
     """Display search results in a formatted table."""
@@ -238,19 +580,20 @@ def display_results(results: List[Dict[str, Any]], query: str):
             result['snippet'][:60] + "..." if len(result['snippet']) > 60 else result['snippet']
         )
     
-    console.print(table)
-    
-    # Also print as a list for easier copying
-    console.print("\n[bold]Full Results:[/bold]")
-    for idx, result in enumerate(results, 1):
-        panel = Panel(
+    # Also show as a list for easier copying
+    panels = [
+        Panel(
             f"[green]{result['title']}[/green]\n"
             f"[blue]{result['url']}[/blue]\n"
             f"[white]{result['snippet']}[/white]",
             title=f"Result {idx}",
             expand=False
         )
-        console.print(panel)
+        for idx, result in enumerate(results, 1)
+    ]
+    
+    # One render pass and terminal write for the whole output
+    console.print(Group(table, "\n[bold]Full Results:[/bold]", *panels))
 
 
 async def perform_web_search(query: str, limit: int = 10, engine: str = "google", headless: bool = True):
@@ -265,9 +608,14 @@ async def perform_web_search(query: str, limit: int = 10, engine: str = "google"
                 results = await searcher.search_duckduckgo(query, limit)
             elif engine.lower() == "hackernews" or engine.lower() == "hn":
                 results = await searcher.search_hackernews(query, limit)
+            elif engine.lower() == "all":
+                results = await searcher.search_all(query, limit)
             else:
                 console.print(f"[red]Unknown search engine: {engine}[/red]")
-                console.print("[yellow]Available engines: google, duckduckgo, hackernews[/yellow]")
+                console.print(
+                    "[yellow]Available engines: "
+                    "google, duckduckgo, hackernews, all[/yellow]"
+                )
                 return
         
         display_results(results, query)
\ No newline at end of file
@@ -1,4 +1,7 @@
+import atexit
+import bisect
 import os
+import re
 import sys
 import subprocess
 import shlex
@@ -6,17 +9,17 @@ import asyncio
 from typing import List, Tuple, Optional, Dict
 from pathlib import Path
 import json
-import readline
-import platform
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.prompt import Prompt
-from rich.syntax import Syntax
 from rich.panel import Panel
 from rich.table import Table
+from rich.live import Live
+from rich.markup import escape
+from rich.spinner import Spinner
 from rich import print as rprint
 
-from aishell.shell.nl_converter import get_nl_converter, NLConverter
+from aishell.shell.nl_converter import get_nl_converter, NLCommandCache, NLConverter
 from aishell.llm import (
     ClaudeLLMProvider,
     OpenAILLMProvider,
@@ -24,32 +27,212 @@ from aishell.llm import (
     GeminiLLMProvider,
     OpenRouterLLMProvider,
     Conversation,
+    LLMProvider,
+    LLMResponse,
+    StreamError,
 )
 from aishell.mcp import MCPClient, MCPMessage, NLToMCPTranslator
 from aishell.utils import (
     get_transcript_manager,
+    EnvManager,
     get_env_manager,
     load_env_on_startup,
     get_mcp_capability_manager,
+    StreamPrinter,
+    response_renderable,
 )
 
 console = Console()
 
+# Built-in aliases; entries in ~/.aishell_aliases override them
+_DEFAULT_ALIASES = {
+    "ll": "ls -la",
+    "la": "ls -a",
+    "l": "ls -l",
+    "..": "cd ..",
+    "...": "cd ../..",
+    "g": "git",
+    "d": "docker",
+    "p": "python",
+    "cls": "clear",
+}
+
+# alias file path -> (mtime_ns, parsed aliases); the file rarely changes, so
+# repeated IntelligentShell instances skip re-reading and re-parsing it
+_alias_file_cache: Dict[Path, Tuple[int, Dict[str, str]]] = {}
+
+
+def _read_alias_file(alias_file: Path) -> Dict[str, str]:
+    """Read a JSON alias file, reusing the last parse while it is unchanged."""
+    mtime = alias_file.stat().st_mtime_ns
+    cached = _alias_file_cache.get(alias_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    user_aliases = json.loads(alias_file.read_bytes())
+    _alias_file_cache[alias_file] = (mtime, user_aliases)
+    return user_aliases
+
+
+# Characters that need /bin/sh to interpret: pipes, redirection, chaining,
+# globbing, expansion and leading VAR=value assignments. Commands without
+# any of them are run directly, saving the intermediate shell process.
+_SHELL_METACHARS = frozenset("|&;<>()$`*?[]{}~!#=\n")
+
+# Characters that make a cd argument need shlex parsing
+_CD_SPECIAL_CHARS = frozenset("'\"\\ \t")
+
+# Characters that make a command line need shlex to split it
+_QUOTE_CHARS = frozenset("'\"\\")
+
+# SGR escape codes in the rendered prompt
+_ANSI_ESCAPE_RE = re.compile(r"(\x1b\[[0-9;]*m)")
+
+# Shown for a bare "env"
+_ENV_HELP = """Usage: env <subcommand> [args]
+
+Subcommands:
+  reload              Reload .env file
+  show [filter]       Show environment variables (optionally filtered)
+  get <key>           Get value of environment variable
+  set <key> <value>   Set environment variable (runtime only)
+  llm <provider>      Show LLM configuration for provider
+  default <provider>  Set default LLM provider (runtime only)
+  mcp                 Show configured MCP servers
+  mcp-list            List all available MCP server types
+
+Examples:
+  env reload
+  env show API
+  env get ANTHROPIC_API_KEY
+  env set TEMP_VAR value
+  env llm claude
+  env default openai
+  env mcp
+  env mcp-list"""
+
+
+def _split_args(command: str) -> List[str]:
+    """Split a command line like shlex.split, which is only needed for quoting."""
+    if _QUOTE_CHARS.isdisjoint(command):
+        return command.split()
+    return shlex.split(command)
+
+
+def _find_git_head(start: Path) -> Optional[Path]:
+    """Find the HEAD file of the git repository containing ``start``."""
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git / "HEAD"
+        if dot_git.is_file():
+            # Worktrees and submodules use a ".git" file pointing at the git dir
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:") :].strip())
+                if not git_dir.is_absolute():
+                    git_dir = directory / git_dir
+                return git_dir / "HEAD"
+            return None
+    return None
+
+
+# Words that suggest a query could use an MCP server. Matched as plain
+# substrings: a handful of `in` checks beats a regex alternation here.
+_MCP_KEYWORDS = (
+    "database",
+    "sql",
+    "query",
+    "table",
+    "postgres",
+    "mysql",
+    "sqlite",
+    "github",
+    "gitlab",
+    "repository",
+    "repo",
+    "git",
+    "commit",
+    "issue",
+    "jira",
+    "atlassian",
+    "ticket",
+    "project",
+    "task",
+    "workflow",
+    "docker",
+    "container",
+    "kubernetes",
+    "k8s",
+    "pod",
+    "deployment",
+    "aws",
+    "s3",
+    "cloud",
+    "storage",
+    "bucket",
+    "gcp",
+    "google cloud",
+    "file",
+    "directory",
+    "folder",
+    "filesystem",
+    "web",
+    "fetch",
+    "url",
+    "memory",
+    "remember",
+    "store",
+    "recall",
+    "knowledge",
+)
+
 
 class CommandHistory:
-    """Manage command history with persistence."""
+    """Manage command history with persistence.
 
-    def __init__(self, history_file: str = "~/.aishell_history"):
+    Commands are appended to the history file through a line-buffered handle
+    kept open between adds. The file is only rewritten, trimmed to
+    ``max_entries``, every ``compact_every`` adds and on close (at the latest
+    at exit). History is read from disk on first access.
+    """
+
+    def __init__(
+        self,
+        history_file: str = "~/.aishell_history",
+        max_entries: int = 1000,
+        compact_every: int = 256,
+    ):
         self.history_file = Path(history_file).expanduser()
-        self.history: List[str] = []
-        self.load_history()
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self._history: Optional[List[str]] = None
+        self._adds_since_compact = 0
+        self._checked_trailing_newline = False
+        self._atexit_registered = False
+        self._fh = None
+
+    @property
+    def history(self) -> List[str]:
+        """Command history, loaded from file on first access."""
+        if self._history is None:
+            self.load_history()
+        return self._history
+
+    @history.setter
+    def history(self, value: List[str]):
+        self._history = value
 
     def load_history(self):
         """Load command history from file."""
+        self._history = []
         try:
-            if self.history_file.exists():
-                with open(self.history_file, "r") as f:
-                    self.history = [line.strip() for line in f.readlines()]
+            self._history = self.history_file.read_text(errors="replace").splitlines()
+        except FileNotFoundError:
+            pass
         except Exception as e:
             console.print(f"[yellow]Warning: Could not load history: {e}[/yellow]")
 
@@ -57,16 +240,63 @@ class CommandHistory:
         """Save command history to file."""
         try:
             self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            recent = self.history[-self.max_entries :]
             with open(self.history_file, "w") as f:
-                f.write("\n".join(self.history[-1000:]))  # Keep last 1000 commands
+                f.write("".join(f"{command}\n" for command in recent))
+            # Trim memory too, so a long session holds at most
+            # max_entries + compact_every commands
+            self._history = recent
+            self._adds_since_compact = 0
+            self._checked_trailing_newline = True
+        except Exception as e:
+            console.print(f"[yellow]Warning: Could not save history: {e}[/yellow]")
+
+    def _append_to_file(self, command: str):
+        """Append a single command to the history file."""
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            prefix = ""
+            if not self._checked_trailing_newline:
+                # Older versions wrote the file without a final newline
+                self._checked_trailing_newline = True
+                if self.history_file.exists() and self.history_file.stat().st_size:
+                    with open(self.history_file, "rb") as f:
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b"\n":
+                            prefix = "\n"
+            if self._fh is None:
+                self._fh = open(self.history_file, "a", buffering=1)
+            self._fh.write(f"{prefix}{command}\n")
         except Exception as e:
             console.print(f"[yellow]Warning: Could not save history: {e}[/yellow]")
 
+    def compact(self):
+        """Trim the history file to the most recent ``max_entries`` commands."""
+        if self._adds_since_compact:
+            # Re-read so entries appended by other sessions are kept
+            self.load_history()
+            self.save_history()
+
+    def close(self):
+        """Compact the history file and release the append handle."""
+        self.compact()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
     def add(self, command: str):
         """Add command to history."""
         if command and command not in ["exit", "quit"]:
-            self.history.append(command)
-            self.save_history()
+            if self._history is not None:
+                self._history.append(command)
+            self._append_to_file(command)
+            self._adds_since_compact += 1
+
+            if not self._atexit_registered:
+                self._atexit_registered = True
+                atexit.register(self.close)
+            if self._adds_since_compact >= self.compact_every:
+                self.compact()
 
 
 class CommandSuggester:
@@ -100,55 +330,133 @@ class CommandSuggester:
             "format": "c:",
         }
 
-    def suggest_completion(self, partial_command: str) -> List[str]:
+        # Directory listings for path completion: abs path -> (mtime_ns, entries)
+        self.max_cached_dirs = 64
+        self._dir_cache: Dict[str, Tuple[int, List[Tuple[str, bool]]]] = {}
+
+        # Sorted $PATH executables and the (dirs, mtimes) they were read at
+        self._path_bins: Optional[List[str]] = None
+        self._path_bins_key: Optional[Tuple] = None
+
+        # Precomputed "<cmd> <sub>" suggestions per base command
+        self._completions = {
+            base: [f"{base} {sub}" for sub in subs]
+            for base, subs in self.common_commands.items()
+        }
+
+        # One alternation scans for every dangerous pattern in a single pass;
+        # the matching group index maps back to its (cmd, pattern) pair
+        self._dangerous_pairs = list(self.dangerous_commands.items())
+        self._dangerous_re = re.compile(
+            "|".join(
+                rf"(\b{re.escape(cmd)}\b.*{re.escape(pattern)})"
+                for cmd, pattern in self._dangerous_pairs
+            )
+        )
+
+    def suggest_completion(self, partial_command: str, limit: int = 10) -> List[str]:
         """Suggest command completions based on partial input."""
-        suggestions = []
         parts = partial_command.split()
 
         if not parts:
-            return suggestions
+            return []
 
-        base_cmd = parts[0]
+        # Check for common command patterns, then executables on $PATH
+        if len(parts) == 1:
+            completions = self._completions.get(parts[0])
+            if completions is not None:
+                return completions[:limit]
+            return self._complete_executable(parts[0], limit)
 
-        # Check for common command patterns
-        if base_cmd in self.common_commands and len(parts) == 1:
-            suggestions = [
-                f"{base_cmd} {sub}" for sub in self.common_commands[base_cmd]
-            ]
+        # File/directory completion, which stops scanning at the limit
+        last_part = parts[-1]
+        if "/" in last_part or last_part.startswith("."):
+            return self._complete_path(last_part, limit)
 
-        # File/directory completion
-        if len(parts) >= 2:
-            last_part = parts[-1]
-            if "/" in last_part or last_part.startswith("."):
-                suggestions.extend(self._complete_path(last_part))
+        return []
 
-        return suggestions[:10]  # Limit suggestions
+    def _path_executables(self) -> List[str]:
+        """Sorted names of the files in $PATH directories.
 
-    def _complete_path(self, partial_path: str) -> List[str]:
+        Directories are only rescanned when $PATH or one of their mtimes
+        changes, which costs a stat per directory instead of a full listing.
+        """
+        path_dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        mtimes = []
+        for directory in path_dirs:
+            try:
+                mtimes.append(os.stat(directory).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        key = (tuple(path_dirs), tuple(mtimes))
+
+        if self._path_bins is None or self._path_bins_key != key:
+            names = set()
+            for directory, mtime in zip(path_dirs, mtimes):
+                if mtime is None:
+                    continue
+                try:
+                    with os.scandir(directory) as it:
+                        names.update(entry.name for entry in it if entry.is_file())
+                except OSError:
+                    continue
+            self._path_bins = sorted(names)
+            self._path_bins_key = key
+        return self._path_bins
+
+    def _complete_executable(self, prefix: str, limit: int = 10) -> List[str]:
+        """Complete a command name from the executables on $PATH."""
+        names = self._path_executables()
+        matches = []
+        # Names are sorted, so the matches are one contiguous run
+        for name in names[bisect.bisect_left(names, prefix) :]:
+            if not name.startswith(prefix) or len(matches) >= limit:
+                break
+            matches.append(name)
+        return matches
+
+    def _list_directory(self, directory: str) -> List[Tuple[str, bool]]:
+        """Sorted (name, is_dir) entries of a directory, cached on its mtime."""
+        directory = os.path.abspath(directory)
+        mtime = os.stat(directory).st_mtime_ns
+        cached = self._dir_cache.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        # scandir's DirEntry knows the entry type without an extra stat
+        with os.scandir(directory) as it:
+            entries = sorted((entry.name, entry.is_dir()) for entry in it)
+
+        self._dir_cache.pop(directory, None)
+        self._dir_cache[directory] = (mtime, entries)
+        if len(self._dir_cache) > self.max_cached_dirs:
+            # Dicts keep insertion order, so this drops the oldest listing
+            del self._dir_cache[next(iter(self._dir_cache))]
+        return entries
+
+    def _complete_path(self, partial_path: str, limit: int = 10) -> List[str]:
         """Complete file/directory paths."""
+        parent, prefix = os.path.split(partial_path)
         try:
-            path = Path(partial_path)
-            parent = path.parent
-            prefix = path.name
-
-            if parent.exists():
-                matches = []
-                for item in parent.iterdir():
-                    if item.name.startswith(prefix):
-                        if item.is_dir():
-                            matches.append(str(item) + "/")
-                        else:
-                            matches.append(str(item))
-                return matches
-        except Exception:
-            pass
-        return []
+            entries = self._list_directory(os.path.expanduser(parent) or ".")
+        except OSError:
+            return []
+
+        matches = []
+        # Entries are sorted, so the matches are one contiguous run
+        for name, is_dir in entries[bisect.bisect_left(entries, (prefix,)) :]:
+            if not name.startswith(prefix) or len(matches) >= limit:
+                break
+            path = os.path.join(parent, name)
+            matches.append(path + "/" if is_dir else path)
+        return matches
 
     def check_dangerous(self, command: str) -> Optional[str]:
         """Check if command might be dangerous."""
-        for cmd, pattern in self.dangerous_commands.items():
-            if cmd in command and pattern in command:
-                return f"⚠️  Warning: This command contains potentially dangerous patterns ({cmd} {pattern})"
+        match = self._dangerous_re.search(command)
+        if match:
+            cmd, pattern = self._dangerous_pairs[match.lastindex - 1]
+            return f"⚠️  Warning: This command contains potentially dangerous patterns ({cmd} {pattern})"
         return None
 
 
@@ -160,15 +468,36 @@ class IntelligentShell:
     ):
         self.history = CommandHistory()
         self.suggester = CommandSuggester()
-        self.aliases: Dict[str, str] = self._load_aliases()
+        # Alias listings and the help screen; reset when aliases is replaced
+        self._sorted_aliases: Optional[List[Tuple[str, str]]] = None
+        self._alias_text: Optional[str] = None
+        self._help_cache: Optional[Tuple[bool, Group]] = None
+        self.aliases = self._load_aliases()
         self.env_vars: Dict[str, str] = {}
+        # os.environ merged with env_vars; reset whenever either changes
+        self._env_cache: Optional[Dict[str, str]] = None
         self.current_dir = Path.cwd()
+        # Home directory as strings so format_prompt can prefix-match
+        self._home_str = str(Path.home())
+        self._home_prefix = self._home_str.rstrip(os.sep) + os.sep
+        # cwd -> (HEAD mtime_ns, branch) for format_prompt
+        self._git_branch_cache: Dict[Path, Tuple[int, str]] = {}
+        # cwd -> cwd mtime_ns when no repository was found above it
+        self._no_git_cache: Dict[Path, int] = {}
+        # (prompt markup, rendered ANSI prompt) for the main loop's input()
+        self._prompt_ansi: Optional[Tuple[str, str]] = None
+        # One event loop for all async commands, so providers can keep their
+        # HTTP clients (and connection pools) between queries
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # provider name -> ((api_key, base_url), provider)
+        self._providers: Dict[str, Tuple[Tuple, LLMProvider]] = {}
 
         # Load environment variables
         load_env_on_startup(verbose=True)
 
         # Initialize NL converter
         self.nl_converter: Optional[NLConverter] = None
+        self._nl_cache = NLCommandCache("~/.aishell_nl_cache.json")
         try:
             nl_converter_kwargs = nl_converter_kwargs or {}
             self.nl_converter = get_nl_converter(nl_provider, **nl_converter_kwargs)
@@ -183,134 +512,245 @@ class IntelligentShell:
                 "[dim]You can still use the shell with regular commands[/dim]"
             )
 
+    @property
+    def aliases(self) -> Dict[str, str]:
+        return self._aliases
+
+    @aliases.setter
+    def aliases(self, value: Dict[str, str]):
+        self._aliases = value
+        self._sorted_aliases = None
+        self._alias_text = None
+        self._help_cache = None
+
+    def _alias_listing(self) -> List[Tuple[str, str]]:
+        """Return aliases sorted by name, computed once per alias set."""
+        if self._sorted_aliases is None:
+            self._sorted_aliases = sorted(self._aliases.items())
+        return self._sorted_aliases
+
     def _load_aliases(self) -> Dict[str, str]:
         """Load shell aliases."""
-        aliases = {
-            "ll": "ls -la",
-            "la": "ls -a",
-            "l": "ls -l",
-            "..": "cd ..",
-            "...": "cd ../..",
-            "g": "git",
-            "d": "docker",
-            "p": "python",
-            "cls": "clear",
-        }
-
-        # Try to load user's aliases
+        # Try to load user's aliases; a missing file fails the stat
         try:
-            alias_file = Path("~/.aishell_aliases").expanduser()
-            if alias_file.exists():
-                with open(alias_file, "r") as f:
-                    user_aliases = json.load(f)
-                    aliases.update(user_aliases)
+            user_aliases = _read_alias_file(Path("~/.aishell_aliases").expanduser())
         except Exception:
-            pass
+            user_aliases = {}
 
-        return aliases
+        return {**_DEFAULT_ALIASES, **user_aliases}
 
     def expand_alias(self, command: str) -> str:
-        """Expand command aliases."""
-        parts = shlex.split(command)
-        if parts and parts[0] in self.aliases:
-            parts[0] = self.aliases[parts[0]]
-            return " ".join(parts)
-        return command
-
-    def execute_command(self, command: str) -> Tuple[int, str, str]:
-        """Execute a shell command and return exit code, stdout, stderr."""
+        """Expand command aliases.
+
+        Alias names are single bare words, so only the first token needs
+        looking at; the rest of the command is kept verbatim, quotes included.
+        """
+        head, sep, rest = command.partition(" ")
+        expansion = self.aliases.get(head)
+        if expansion is None:
+            return command
+        return expansion + sep + rest
+
+    # Built-ins by whole command, and by first word when arguments follow.
+    # Values are method names so handlers can be patched per instance.
+    _BUILTIN_COMMANDS = {
+        "pwd": "_handle_pwd",
+        "alias": "_handle_alias",
+        "help": "_handle_help",
+        "llm": "_handle_llm",
+        "mcp": "_handle_mcp",
+        "collate": "_handle_collate",
+        "generate": "_handle_generate",
+        "env": "_handle_env",
+        "chat": "_handle_chat",
+    }
+    _BUILTIN_VERBS = {
+        "cd": "_handle_cd",
+        "export": "_handle_export",
+        "llm": "_handle_llm",
+        "mcp": "_handle_mcp",
+        "collate": "_handle_collate",
+        "generate": "_handle_generate",
+        "env": "_handle_env",
+        "chat": "_handle_chat",
+    }
+    # env subcommand -> method
+    _ENV_SUBCOMMANDS = {
+        "reload": "_env_reload",
+        "show": "_env_show",
+        "get": "_env_get",
+        "set": "_env_set",
+        "llm": "_env_llm",
+        "default": "_env_default",
+        "mcp": "_env_mcp",
+        "mcp-list": "_env_mcp_list",
+    }
+    # Commands starting with these run as shell commands; other input is
+    # treated as a natural language query for the LLM
+    _PASSTHROUGH_PREFIXES = (
+        "cd",
+        "pwd",
+        "export",
+        "alias",
+        "history",
+        "clear",
+        "cls",
+        "help",
+        "exit",
+        "quit",
+        "env",
+        "chat",
+    )
+
+    def execute_command(
+        self, command: str, stream: bool = False
+    ) -> Tuple[int, str, str]:
+        """Execute a shell command and return exit code, stdout, stderr.
+
+        With ``stream=True`` external commands write straight to the terminal
+        as they run, and their stdout/stderr come back empty.
+        """
         # Expand aliases
         command = self.expand_alias(command)
 
         # Handle built-in commands
-        if command.startswith("cd "):
-            return self._handle_cd(command)
-        elif command == "pwd":
-            return 0, str(self.current_dir), ""
-        elif command.startswith("export "):
-            return self._handle_export(command)
-        elif command == "alias":
-            return self._show_aliases()
-        elif command == "help":
-            self._show_help()
-            return 0, "", ""
-        elif command.startswith("llm") and (
-            command == "llm" or command.startswith("llm ")
-        ):
-            return self._handle_llm(command)
-        elif command.startswith("mcp") and (
-            command == "mcp" or command.startswith("mcp ")
-        ):
-            return self._handle_mcp(command)
-        elif command.startswith("collate") and (
-            command == "collate" or command.startswith("collate ")
-        ):
-            return self._handle_collate(command)
-        elif command.startswith("generate") and (
-            command == "generate" or command.startswith("generate ")
-        ):
-            return self._handle_generate(command)
-        elif command.startswith("env") and (
-            command == "env" or command.startswith("env ")
-        ):
-            return self._handle_env(command)
-        elif command.startswith("chat") and (
-            command == "chat" or command.startswith("chat ")
-        ):
-            return self._handle_chat(command)
+        handler = self._BUILTIN_COMMANDS.get(command)
+        if handler is None:
+            verb, sep, _ = command.partition(" ")
+            if sep:
+                handler = self._BUILTIN_VERBS.get(verb)
+        if handler is not None:
+            return getattr(self, handler)(command)
 
         # Default to LLM command if no other built-in matches
         # Check if it looks like a natural language query
-        if not any(
-            command.startswith(cmd)
-            for cmd in [
-                "cd",
-                "pwd",
-                "export",
-                "alias",
-                "history",
-                "clear",
-                "cls",
-                "help",
-                "exit",
-                "quit",
-                "env",
-                "chat",
-            ]
-        ):
+        if not command.startswith(self._PASSTHROUGH_PREFIXES):
             # Try as LLM command with the entire input as query
             return self._handle_llm(f'llm "{command}"')
 
         # Execute external command
         try:
-            # Update environment with custom vars
-            env = os.environ.copy()
-            env.update(self.env_vars)
-
-            process = subprocess.Popen(
-                command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=self.current_dir,
-                env=env,
-            )
+            process = self._spawn(command, self._command_env(), capture=not stream)
             stdout, stderr = process.communicate()
-            return process.returncode, stdout, stderr
+            return process.returncode, stdout or "", stderr or ""
         except Exception as e:
             return 1, "", str(e)
 
-    def _handle_cd(self, command: str) -> Tuple[int, str, str]:
-        """Handle cd command."""
-        parts = shlex.split(command)
-        if len(parts) == 1:
-            # cd with no args goes to home
-            new_dir = Path.home()
+    def _command_env(self) -> Dict[str, str]:
+        """Environment for external commands, rebuilt only after it changes."""
+        if self._env_cache is None:
+            self._env_cache = {**os.environ, **self.env_vars}
+        return self._env_cache
+
+    def _run_async(self, coro):
+        """Run a coroutine on the shell's event loop, creating it on first use."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            atexit.register(self._close_loop)
+        task = self._loop.create_task(coro)
+        try:
+            return self._loop.run_until_complete(task)
+        except BaseException:
+            # On Ctrl-C, cancel the command (gather cancels its children) so
+            # no request is left running on the shared loop
+            if not task.done():
+                task.cancel()
+                try:
+                    self._loop.run_until_complete(task)
+                except (asyncio.CancelledError, Exception):
+                    pass
+            raise
+
+    def _close_loop(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+
+    def close(self):
+        """Flush history and shut down the event loop."""
+        self.history.close()
+        self._close_loop()
+
+    def _get_provider(self, name: str) -> LLMProvider:
+        """Get the LLM provider for ``name``, configured from the environment.
+
+        Instances are reused across commands for as long as the provider's
+        API key and base URL stay the same.
+        """
+        config = get_env_manager().get_llm_config(name)
+        key = (config.get("api_key"), config.get("base_url"))
+        cached = self._providers.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        if name == "claude":
+            provider = ClaudeLLMProvider(
+                api_key=config.get("api_key"), base_url=config.get("base_url")
+            )
+        elif name == "openai":
+            provider = OpenAILLMProvider(
+                api_key=config.get("api_key"), base_url=config.get("base_url")
+            )
+        elif name == "gemini":
+            provider = GeminiLLMProvider(
+                api_key=config.get("api_key"), base_url=config.get("base_url")
+            )
+        elif name == "ollama":
+            provider = OllamaLLMProvider(base_url=config.get("base_url"))
+        elif name == "openrouter":
+            provider = OpenRouterLLMProvider(
+                api_key=config.get("api_key"), base_url=config.get("base_url")
+            )
         else:
-            new_dir = Path(parts[1]).expanduser()
+            raise ValueError(f"Unknown provider: {name}")
+        self._providers[name] = (key, provider)
+        return provider
+
+    def _spawn(
+        self, command: str, env: Dict[str, str], capture: bool = True
+    ) -> subprocess.Popen:
+        """Start an external command, skipping /bin/sh when it isn't needed.
+
+        Without ``capture`` the command inherits the terminal's stdout/stderr.
+        """
+        pipe = subprocess.PIPE if capture else None
+        popen_kwargs = dict(
+            stdout=pipe,
+            stderr=pipe,
+            text=True,
+            cwd=self.current_dir,
+            env=env,
+        )
+
+        if _SHELL_METACHARS.isdisjoint(command):
+            try:
+                argv = _split_args(command)
+            except ValueError:
+                argv = None
+            if argv:
+                try:
+                    return subprocess.Popen(argv, **popen_kwargs)
+                except FileNotFoundError:
+                    # Shell builtins (history, type, ...) have no executable
+                    pass
 
+        return subprocess.Popen(command, shell=True, **popen_kwargs)
+
+    def _handle_cd(self, command: str) -> Tuple[int, str, str]:
+        """Handle cd command."""
         try:
+            arg = command[2:].strip()
+            # Plain paths skip shlex; quotes, escapes and spaces still need it
+            if not _CD_SPECIAL_CHARS.isdisjoint(arg):
+                parts = shlex.split(arg)
+                arg = parts[0] if parts else ""
+
+            if not arg:
+                # cd with no args goes to home
+                new_dir = Path.home()
+            else:
+                new_dir = Path(arg).expanduser()
+
             if not new_dir.is_absolute():
                 new_dir = self.current_dir / new_dir
             new_dir = new_dir.resolve()
@@ -327,49 +767,116 @@ class IntelligentShell:
     def _handle_export(self, command: str) -> Tuple[int, str, str]:
         """Handle export command."""
         try:
-            parts = command.split("=", 1)
-            if len(parts) == 2:
-                var_name = parts[0].replace("export ", "").strip()
-                var_value = parts[1].strip().strip("\"'")
-                self.env_vars[var_name] = var_value
-                os.environ[var_name] = var_value
-                return 0, f"Exported {var_name}={var_value}", ""
-            else:
+            var_name, sep, var_value = command[7:].partition("=")
+            var_name = var_name.strip()
+            if not sep or not var_name:
                 return 1, "", "export: Invalid syntax"
+            var_value = var_value.strip()
+            # Only remove a matching pair of quotes around the whole value
+            if (
+                len(var_value) > 1
+                and var_value[0] in "\"'"
+                and var_value[-1] == var_value[0]
+            ):
+                var_value = var_value[1:-1]
+            self.env_vars[var_name] = var_value
+            os.environ[var_name] = var_value
+            self._env_cache = None
+            return 0, f"Exported {var_name}={var_value}", ""
         except Exception as e:
             return 1, "", str(e)
 
+    def _handle_pwd(self, command: str) -> Tuple[int, str, str]:
+        return 0, str(self.current_dir), ""
+
+    def _handle_alias(self, command: str) -> Tuple[int, str, str]:
+        return self._show_aliases()
+
+    def _handle_help(self, command: str) -> Tuple[int, str, str]:
+        self._show_help()
+        return 0, "", ""
+
     def _show_aliases(self) -> Tuple[int, str, str]:
         """Show all aliases."""
-        output = []
-        for alias, command in sorted(self.aliases.items()):
-            output.append(f"{alias}='{command}'")
-        return 0, "\n".join(output), ""
+        if self._alias_text is None:
+            self._alias_text = "\n".join(
+                f"{alias}='{command}'" for alias, command in self._alias_listing()
+            )
+        return 0, self._alias_text, ""
 
     def format_prompt(self) -> str:
         """Format the shell prompt."""
         # Get current directory relative to home
-        try:
-            rel_path = self.current_dir.relative_to(Path.home())
-            dir_str = f"~/{rel_path}"
-        except ValueError:
-            dir_str = str(self.current_dir)
+        cwd = str(self.current_dir)
+        if cwd == self._home_str:
+            dir_str = "~"
+        elif cwd.startswith(self._home_prefix):
+            dir_str = "~/" + cwd[len(self._home_prefix) :]
+        else:
+            dir_str = cwd
 
         # Get git branch if in git repo
         git_branch = ""
+        branch = self._git_branch()
+        if branch:
+            git_branch = f" [git:{branch}]"
+
+        return (
+            f"[bold blue]{escape(dir_str)}[/bold blue]"
+            f"[green]{escape(git_branch)}[/green] [bold]$[/bold] "
+        )
+
+    def format_prompt_ansi(self) -> str:
+        """Render the prompt to an ANSI string for input(), cached per markup."""
+        markup = self.format_prompt()
+        if self._prompt_ansi is None or self._prompt_ansi[0] != markup:
+            with console.capture() as capture:
+                console.print(markup, end="", highlight=False)
+            # Mark escape codes as zero-width so readline measures the prompt
+            rendered = _ANSI_ESCAPE_RE.sub("\001\\1\002", capture.get())
+            self._prompt_ansi = (markup, rendered)
+        return self._prompt_ansi[1]
+
+    def _git_branch(self) -> str:
+        """Get the current git branch by reading HEAD, cached on its mtime."""
+        cwd = self.current_dir
         try:
-            result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                capture_output=True,
-                text=True,
-                cwd=self.current_dir,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                git_branch = f" [git:{result.stdout.strip()}]"
-        except Exception:
-            pass
+            cwd_mtime = cwd.stat().st_mtime_ns
+        except OSError:
+            return ""
+        # Outside a repository; creating .git here would change cwd's mtime
+        if self._no_git_cache.get(cwd) == cwd_mtime:
+            return ""
+
+        head = _find_git_head(cwd)
+        if head is None:
+            self._no_git_cache[cwd] = cwd_mtime
+            return ""
+
+        try:
+            mtime = head.stat().st_mtime_ns
+        except OSError:
+            return ""
 
-        return f"[bold blue]{dir_str}[/bold blue][green]{git_branch}[/green] [bold]$[/bold] "
+        cached = self._git_branch_cache.get(cwd)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        branch = ""
+        try:
+            ref = head.read_text().strip()
+        except OSError:
+            ref = ""
+        if ref.startswith("ref: refs/heads/"):
+            branch = ref[len("ref: refs/heads/") :]
+        elif ref.startswith("ref: "):
+            branch = ref[len("ref: ") :]
+        elif ref:
+            # Detached HEAD holds the commit id
+            branch = ref[:7]
+
+        self._git_branch_cache[cwd] = (mtime, branch)
+        return branch
 
     def run(self):
         """Run the interactive shell."""
@@ -383,13 +890,16 @@ class IntelligentShell:
         )
 
         # Set up readline for better input handling
+        import readline
+
         readline.parse_and_bind("tab: complete")
         readline.set_completer(self._readline_completer)
 
         while True:
             try:
-                # Get command with rich prompt
-                command = Prompt.ask(self.format_prompt())
+                # Plain input() with the pre-rendered prompt; Prompt.ask would
+                # parse and render the markup again on every command
+                command = input(self.format_prompt_ansi()).strip()
 
                 if not command:
                     continue
@@ -397,6 +907,7 @@ class IntelligentShell:
                 # Check for exit
                 if command.lower() in ["exit", "quit", "q"]:
                     console.print("[yellow]Goodbye![/yellow]")
+                    self.close()
                     break
 
                 # Check for help
@@ -427,7 +938,7 @@ class IntelligentShell:
                         continue
 
                 # Execute command
-                exit_code, stdout, stderr = self.execute_command(command)
+                exit_code, stdout, stderr = self.execute_command(command, stream=True)
 
                 # Display output
                 if stdout:
@@ -443,6 +954,7 @@ class IntelligentShell:
                 console.print("\n[yellow]Use 'exit' to quit[/yellow]")
             except EOFError:
                 console.print("\n[yellow]Goodbye![/yellow]")
+                self.close()
                 break
             except Exception as e:
                 console.print(f"[red]Error: {e}[/red]")
@@ -450,6 +962,8 @@ class IntelligentShell:
     def _readline_completer(self, text: str, state: int) -> Optional[str]:
         """Readline completer for tab completion."""
         if state == 0:
+            import readline
+
             self.matches = self.suggester.suggest_completion(readline.get_line_buffer())
 
         try:
@@ -461,6 +975,8 @@ class IntelligentShell:
         """Process natural language command."""
         console.print(f"[dim]Converting: {nl_input}[/dim]")
 
+        import platform
+
         # Get context for conversion
         context = {
             "cwd": str(self.current_dir),
@@ -468,22 +984,30 @@ class IntelligentShell:
             "shell": "bash",  # We're simulating bash
         }
 
-        with console.status("[bold green]Thinking..."):
-            command = self.nl_converter.convert(nl_input, context)
+        command = self._nl_cache.get(nl_input, context["os"])
+        cached = command is not None
+        if not cached:
+            with console.status("[bold green]Thinking..."):
+                command = self.nl_converter.convert(nl_input, context)
 
         if command:
-            console.print(f"[green]Command:[/green] {command}")
+            label = "Command (cached):" if cached else "Command:"
+            console.print(f"[green]{label}[/green] {command}")
 
             # Ask for confirmation
             if (
                 Prompt.ask("Execute this command?", choices=["y", "n"], default="y")
                 == "y"
             ):
+                # Only remember conversions the user accepted
+                if not cached:
+                    self._nl_cache.put(nl_input, context["os"], command)
+
                 # Add to history
                 self.history.add(command)
 
                 # Execute command
-                exit_code, stdout, stderr = self.execute_command(command)
+                exit_code, stdout, stderr = self.execute_command(command, stream=True)
 
                 # Display output
                 if stdout:
@@ -501,6 +1025,13 @@ class IntelligentShell:
 
     def _show_help(self):
         """Show help information."""
+        nl_enabled = bool(self.nl_converter)
+        if self._help_cache is None or self._help_cache[0] != nl_enabled:
+            self._help_cache = (nl_enabled, self._build_help(nl_enabled))
+        console.print(self._help_cache[1])
+
+    def _build_help(self, nl_enabled: bool) -> Group:
+        """Build the help screen: command table, NL examples and aliases."""
         help_table = Table(title="AIShell Commands", show_header=True)
         help_table.add_column("Command", style="cyan")
         help_table.add_column("Description", style="white")
@@ -523,17 +1054,17 @@ class IntelligentShell:
         ]
 
         # Add NL command if available
-        if self.nl_converter:
+        if nl_enabled:
             commands.append(("?<request>", "Convert natural language to command"))
 
         for cmd, desc in commands:
             help_table.add_row(cmd, desc)
 
-        console.print(help_table)
+        parts = [help_table]
 
         # Show NL examples if available
-        if self.nl_converter:
-            console.print("\n[bold]Natural Language Examples:[/bold]")
+        if nl_enabled:
+            parts.append("\n[bold]Natural Language Examples:[/bold]")
             examples = [
                 "?list all python files",
                 "?show disk usage",
@@ -542,68 +1073,22 @@ class IntelligentShell:
                 "?create a backup folder",
             ]
             for ex in examples:
-                console.print(f"  [cyan]{ex}[/cyan]")
+                parts.append(f"  [cyan]{ex}[/cyan]")
 
         # Show aliases
-        console.print("\n[bold]Available Aliases:[/bold]")
-        for alias, command in sorted(self.aliases.items())[:10]:
-            console.print(f"  [cyan]{alias}[/cyan] → {command}")
+        parts.append("\n[bold]Available Aliases:[/bold]")
+        for alias, command in self._alias_listing()[:10]:
+            parts.append(f"  [cyan]{alias}[/cyan] → {command}")
         if len(self.aliases) > 10:
-            console.print(f"  [dim]... and {len(self.aliases) - 10} more[/dim]")
+            parts.append(f"  [dim]... and {len(self.aliases) - 10} more[/dim]")
+
+        return Group(*parts)
 
     def _enhance_query_with_mcp_context(self, query: str) -> str:
         """Enhance LLM query with MCP capability context when relevant."""
         # Check if query might benefit from MCP context
-        mcp_keywords = [
-            "database",
-            "sql",
-            "query",
-            "table",
-            "postgres",
-            "mysql",
-            "sqlite",
-            "github",
-            "gitlab",
-            "repository",
-            "repo",
-            "git",
-            "commit",
-            "issue",
-            "jira",
-            "atlassian",
-            "ticket",
-            "project",
-            "task",
-            "workflow",
-            "docker",
-            "container",
-            "kubernetes",
-            "k8s",
-            "pod",
-            "deployment",
-            "aws",
-            "s3",
-            "cloud",
-            "storage",
-            "bucket",
-            "gcp",
-            "google cloud",
-            "file",
-            "directory",
-            "folder",
-            "filesystem",
-            "web",
-            "fetch",
-            "url",
-            "memory",
-            "remember",
-            "store",
-            "recall",
-            "knowledge",
-        ]
-
         query_lower = query.lower()
-        if any(keyword in query_lower for keyword in mcp_keywords):
+        if any(keyword in query_lower for keyword in _MCP_KEYWORDS):
             mcp_manager = get_mcp_capability_manager()
             mcp_context = mcp_manager.generate_mcp_context_prompt()
 
@@ -620,7 +1105,7 @@ Please consider whether any of the available MCP tools could help with this requ
     def _handle_llm(self, command: str) -> Tuple[int, str, str]:
         """Handle LLM queries with new syntax: llm [provider] 'query'."""
         try:
-            parts = shlex.split(command)
+            parts = _split_args(command)
             if len(parts) < 2:
                 return (
                     1,
@@ -689,46 +1174,20 @@ Please consider whether any of the available MCP tools could help with this requ
                 else:
                     i += 1
 
-            # Create provider with env config
-            env_manager = get_env_manager()
-            config = env_manager.get_llm_config(provider_name)
-
-            provider_map = {
-                "claude": ClaudeLLMProvider,
-                "openai": OpenAILLMProvider,
-                "ollama": OllamaLLMProvider,
-                "gemini": GeminiLLMProvider,
-                "openrouter": OpenRouterLLMProvider,
-            }
-
-            if provider_name not in provider_map:
+            if provider_name not in (
+                "claude",
+                "openai",
+                "ollama",
+                "gemini",
+                "openrouter",
+            ):
                 return (
                     1,
                     "",
                     f"Unknown provider: {provider_name}. Use: claude, openai, ollama, gemini, openrouter",
                 )
 
-            # Create provider with configuration from env
-            if provider_name == "claude":
-                provider = provider_map[provider_name](
-                    api_key=config.get("api_key"), base_url=config.get("base_url")
-                )
-            elif provider_name == "openai":
-                provider = provider_map[provider_name](
-                    api_key=config.get("api_key"), base_url=config.get("base_url")
-                )
-            elif provider_name == "gemini":
-                provider = provider_map[provider_name](
-                    api_key=config.get("api_key"), base_url=config.get("base_url")
-                )
-            elif provider_name == "ollama":
-                provider = provider_map[provider_name](base_url=config.get("base_url"))
-            elif provider_name == "openrouter":
-                provider = provider_map[provider_name](
-                    api_key=config.get("api_key"), base_url=config.get("base_url")
-                )
-            else:
-                provider = provider_map[provider_name]()
+            provider = self._get_provider(provider_name)
 
             # Enhance query with MCP context if relevant
             enhanced_query = self._enhance_query_with_mcp_context(query)
@@ -749,11 +1208,12 @@ Please consider whether any of the available MCP tools could help with this requ
 
                 if stream:
                     console.print(f"[blue]Streaming from {provider_name}...[/blue]")
-                    streamed_content = ""
+                    printer = StreamPrinter(console)
                     async for chunk in provider.stream_query(enhanced_query):
-                        console.print(chunk, end="")
-                        streamed_content += chunk
+                        printer.write(chunk)
+                    printer.flush()
                     console.print()  # Final newline
+                    streamed_content = printer.text
 
                     # Log streamed response to transcript (use original query for logging)
                     transcript.log_interaction(
@@ -785,7 +1245,7 @@ Please consider whether any of the available MCP tools could help with this requ
                         )
                     else:
                         panel = Panel(
-                            response.content,
+                            response_renderable(response.content),
                             title=f"[green]{provider_name.title()} Response[/green]",
                             subtitle=f"Model: {response.model}",
                             border_style="green",
@@ -820,7 +1280,7 @@ Please consider whether any of the available MCP tools could help with this requ
                             usage=response.usage,
                         )
 
-            asyncio.run(run_query())
+            self._run_async(run_query())
             return 0, "", ""
 
         except Exception as e:
@@ -829,7 +1289,7 @@ Please consider whether any of the available MCP tools could help with this requ
     def _handle_mcp(self, command: str) -> Tuple[int, str, str]:
         """Handle MCP commands."""
         try:
-            parts = shlex.split(command)
+            parts = _split_args(command)
             if len(parts) < 2:
                 return 1, "", "Usage: mcp <server_url> <command> [args]"
 
@@ -877,7 +1337,7 @@ Please consider whether any of the available MCP tools could help with this requ
                             response, f"Response for: {message.method}"
                         )
 
-            asyncio.run(run_mcp())
+            self._run_async(run_mcp())
             return 0, "", ""
 
         except Exception as e:
@@ -886,7 +1346,7 @@ Please consider whether any of the available MCP tools could help with this requ
     def _handle_collate(self, command: str) -> Tuple[int, str, str]:
         """Handle multi-LLM collations with syntax: collate <provider1> <provider2> [provider3...] 'query' [--no-save] [--db path]."""
         try:
-            parts = shlex.split(command)
+            parts = _split_args(command)
             if len(parts) < 4:
                 return (
                     1,
@@ -946,36 +1406,8 @@ Please consider whether any of the available MCP tools could help with this requ
                 console.print("[yellow]Warning: Duplicate providers specified[/yellow]")
 
             async def run_comparison():
-                env_manager = get_env_manager()
-
-                # Create only requested provider instances
-                provider_map = {}
-                for name in providers:
-                    config = env_manager.get_llm_config(name)
-                    if name == "claude":
-                        provider_map[name] = ClaudeLLMProvider(
-                            api_key=config.get("api_key"),
-                            base_url=config.get("base_url"),
-                        )
-                    elif name == "openai":
-                        provider_map[name] = OpenAILLMProvider(
-                            api_key=config.get("api_key"),
-                            base_url=config.get("base_url"),
-                        )
-                    elif name == "gemini":
-                        provider_map[name] = GeminiLLMProvider(
-                            api_key=config.get("api_key"),
-                            base_url=config.get("base_url"),
-                        )
-                    elif name == "ollama":
-                        provider_map[name] = OllamaLLMProvider(
-                            base_url=config.get("base_url")
-                        )
-                    elif name == "openrouter":
-                        provider_map[name] = OpenRouterLLMProvider(
-                            api_key=config.get("api_key"),
-                            base_url=config.get("base_url"),
-                        )
+                # Only the requested providers
+                provider_map = {name: self._get_provider(name) for name in providers}
 
                 console.print(
                     f"[blue]Querying {len(providers)} providers simultaneously...[/blue]"
@@ -988,48 +1420,67 @@ Please consider whether any of the available MCP tools could help with this requ
                         )
                 console.print()
 
-                # Run queries concurrently using asyncio.gather
+                # Failures become error responses so they get a row too
                 async def query_provider(name, provider):
                     try:
                         response = await provider.query(query)
                         return (name, response)
                     except Exception as e:
-                        from aishell.llm import LLMResponse
-
                         error_response = LLMResponse(
                             content="", model="unknown", provider=name, error=str(e)
                         )
                         return (name, error_response)
 
-                with console.status("[yellow]Waiting for responses...[/yellow]"):
-                    tasks = [
-                        query_provider(name, provider)
-                        for name, provider in provider_map.items()
-                    ]
-                    results = await asyncio.gather(*tasks)
-
                 # Create collation table
                 table = Table(title="LLM Responses Collation", show_lines=True)
                 table.add_column("Provider", style="cyan", width=12)
                 table.add_column("Response", style="white", no_wrap=False)
                 table.add_column("Tokens", style="dim", width=10)
 
-                for provider_name, response in results:
-                    if response.is_error:
-                        table.add_row(
-                            provider_name.title(),
-                            f"[red]Error: {response.error}[/red]",
-                            "-",
-                        )
-                    else:
-                        tokens = (
-                            str(response.usage.get("total_tokens", "-"))
-                            if response.usage
-                            else "-"
-                        )
-                        table.add_row(provider_name.title(), response.content, tokens)
+                # Add each row as its provider answers rather than waiting
+                # for the slowest one
+                tasks = [
+                    asyncio.ensure_future(query_provider(name, provider))
+                    for name, provider in provider_map.items()
+                ]
+                results = []
+                table.caption = f"Waiting for {len(tasks)} response(s)..."
+                try:
+                    with Live(table, console=console, refresh_per_second=8):
+                        for next_result in asyncio.as_completed(tasks):
+                            provider_name, response = await next_result
+                            results.append((provider_name, response))
+                            remaining = len(tasks) - len(results)
+                            table.caption = (
+                                f"Waiting for {remaining} response(s)..."
+                                if remaining
+                                else None
+                            )
+                            if response.is_error:
+                                table.add_row(
+                                    provider_name.title(),
+                                    f"[red]Error: {response.error}[/red]",
+                                    "-",
+                                )
+                            else:
+                                tokens = (
+                                    str(response.usage.get("total_tokens", "-"))
+                                    if response.usage
+                                    else "-"
+                                )
+                                table.add_row(
+                                    provider_name.title(),
+                                    response_renderable(response.content),
+                                    tokens,
+                                )
+                finally:
+                    # Don't leave queries running if this is interrupted
+                    for task in tasks:
+                        task.cancel()
 
-                console.print(table)
+                # Transcript and database keep the requested provider order
+                order = list(provider_map)
+                results.sort(key=lambda result: order.index(result[0]))
 
                 # Log to transcript
                 transcript = get_transcript_manager()
@@ -1057,7 +1508,7 @@ Please consider whether any of the available MCP tools could help with this requ
                             f"[yellow]Warning: Could not save to database: {e}[/yellow]"
                         )
 
-            asyncio.run(run_comparison())
+            self._run_async(run_comparison())
             return 0, "", ""
 
         except Exception as e:
@@ -1066,7 +1517,7 @@ Please consider whether any of the available MCP tools could help with this requ
     def _handle_generate(self, command: str) -> Tuple[int, str, str]:
         """Handle code generation commands."""
         try:
-            parts = shlex.split(command)
+            parts = _split_args(command)
             if len(parts) < 3:
                 return 1, "", "Usage: generate <language> <description>"
 
@@ -1087,30 +1538,45 @@ Task: {description}"""
 
             async def run_generation():
                 # Use Claude for code generation by default
-                provider = ClaudeLLMProvider()
+                provider = self._get_provider("claude")
 
-                with console.status(f"[yellow]Generating {language} code...[/yellow]"):
-                    response = await provider.query(prompt, temperature=0.3)
+                # Display code with syntax highlighting
+                from rich.syntax import Syntax
 
-                if response.is_error:
-                    console.print(f"[red]Generation failed:[/red] {response.error}")
-                else:
-                    # Display code with syntax highlighting
-                    syntax = Syntax(
-                        response.content,
-                        language.lower(),
-                        theme="monokai",
-                        line_numbers=True,
-                    )
-                    panel = Panel(
-                        syntax,
+                def code_panel(code: str) -> Panel:
+                    return Panel(
+                        Syntax(
+                            code, language.lower(), theme="monokai", line_numbers=True
+                        ),
                         title=f"[green]Generated {language.title()} Code[/green]",
                         border_style="green",
                         padding=(1, 2),
                     )
-                    console.print(panel)
 
-            asyncio.run(run_generation())
+                # Show the code as it streams in; the finished panel is
+                # printed once the stream closes
+                chunks = []
+                error = None
+                spinner = Spinner(
+                    "dots", text=f"[yellow]Generating {language} code...[/yellow]"
+                )
+                with Live(
+                    spinner, console=console, refresh_per_second=8, transient=True
+                ) as live:
+                    async for chunk in provider.stream_query(prompt, temperature=0.3):
+                        # A failure can follow partial output
+                        if isinstance(chunk, StreamError):
+                            error = chunk.message
+                            break
+                        chunks.append(chunk)
+                        live.update(code_panel("".join(chunks)))
+
+                if error is not None:
+                    console.print(f"[red]Generation failed:[/red] {error}")
+                else:
+                    console.print(code_panel("".join(chunks)))
+
+            self._run_async(run_generation())
             return 0, "", ""
 
         except Exception as e:
@@ -1119,198 +1585,194 @@ Task: {description}"""
     def _handle_env(self, command: str) -> Tuple[int, str, str]:
         """Handle environment variable commands."""
         try:
-            parts = shlex.split(command)
+            parts = _split_args(command)
             if len(parts) < 2:
-                help_text = """Usage: env <subcommand> [args]
-
-Subcommands:
-  reload              Reload .env file
-  show [filter]       Show environment variables (optionally filtered)
-  get <key>           Get value of environment variable
-  set <key> <value>   Set environment variable (runtime only)
-  llm <provider>      Show LLM configuration for provider
-  default <provider>  Set default LLM provider (runtime only)
-  mcp                 Show configured MCP servers
-  mcp-list            List all available MCP server types
-
-Examples:
-  env reload
-  env show API
-  env get ANTHROPIC_API_KEY
-  env set TEMP_VAR value
-  env llm claude
-  env default openai
-  env mcp
-  env mcp-list"""
-                console.print(help_text)
+                console.print(_ENV_HELP)
                 return 0, "", ""
 
-            env_manager = get_env_manager()
             subcommand = parts[1].lower()
-
-            if subcommand == "reload":
-                success = env_manager.reload_env()
-                return 0 if success else 1, "", ""
-
-            elif subcommand == "show":
-                filter_pattern = parts[2] if len(parts) > 2 else None
-                env_manager.show_env(filter_pattern)
-                return 0, "", ""
-
-            elif subcommand == "get":
-                if len(parts) < 3:
-                    return 1, "", "Usage: env get <key>"
-
-                key = parts[2]
-                value = env_manager.get_var(key)
-                if value is not None:
-                    console.print(f"[cyan]{key}[/cyan] = {value}")
-                else:
-                    console.print(f"[yellow]Variable {key} not found[/yellow]")
-                return 0, "", ""
-
-            elif subcommand == "set":
-                if len(parts) < 4:
-                    return 1, "", "Usage: env set <key> <value>"
-
-                key = parts[2]
-                value = parts[3]
-                env_manager.set_var(key, value)
-                return 0, "", ""
-
-            elif subcommand == "llm":
-                if len(parts) < 3:
-                    providers = ["claude", "openai", "gemini", "ollama"]
-                    console.print("Available providers: " + ", ".join(providers))
-                    return 0, "", ""
-
-                provider = parts[2].lower()
-                config = env_manager.get_llm_config(provider)
-
-                if not config:
-                    return 1, "", f"Unknown provider: {provider}"
-
-                from rich.table import Table
-
-                table = Table(
-                    title=f"{provider.title()} Configuration", show_header=True
+            handler = self._ENV_SUBCOMMANDS.get(subcommand)
+            if handler is None:
+                return (
+                    1,
+                    "",
+                    f"Unknown subcommand: {subcommand}. Use: reload, show, get, set, llm, default, mcp, mcp-list",
                 )
-                table.add_column("Setting", style="cyan")
-                table.add_column("Value", style="white")
-
-                for key, value in config.items():
-                    if value is None:
-                        display_value = "[red]Not set[/red]"
-                    elif "key" in key.lower() or "token" in key.lower():
-                        # Mask sensitive values
-                        if len(value) > 8:
-                            display_value = value[:4] + "..." + value[-4:]
-                        else:
-                            display_value = "***"
-                    else:
-                        display_value = value
 
-                    table.add_row(key, display_value)
+            if subcommand in ("reload", "set", "default"):
+                # These change os.environ
+                self._env_cache = None
 
-                console.print(table)
-                return 0, "", ""
-
-            elif subcommand == "default":
-                if len(parts) < 3:
-                    current_default = env_manager.get_var(
-                        "DEFAULT_LLM_PROVIDER", "claude"
-                    )
-                    console.print(
-                        f"Current default LLM provider: [cyan]{current_default}[/cyan]"
-                    )
-                    console.print("Available providers: claude, openai, gemini, ollama")
-                    console.print("Usage: env default <provider>")
-                    return 0, "", ""
+            return getattr(self, handler)(get_env_manager(), parts)
 
-                provider = parts[2].lower()
-                valid_providers = ["claude", "openai", "gemini", "ollama"]
+        except Exception as e:
+            return 1, "", f"Env error: {str(e)}"
 
-                if provider not in valid_providers:
-                    return (
-                        1,
-                        "",
-                        f"Invalid provider: {provider}. Use: {', '.join(valid_providers)}",
-                    )
+    def _env_reload(
+        self, env_manager: EnvManager, parts: List[str]
+    ) -> Tuple[int, str, str]:
+        """Reload the .env file."""
+        success = env_manager.reload_env()
+        return 0 if success else 1, "", ""
+
+    def _env_show(
+        self, env_manager: EnvManager, parts: List[str]
+    ) -> Tuple[int, str, str]:
+        """Show environment variables, optionally filtered."""
+        filter_pattern = parts[2] if len(parts) > 2 else None
+        env_manager.show_env(filter_pattern)
+        return 0, "", ""
+
+    def _env_get(
+        self, env_manager: EnvManager, parts: List[str]
+    ) -> Tuple[int, str, str]:
+        """Print one environment variable."""
+        if len(parts) < 3:
+            return 1, "", "Usage: env get <key>"
+
+        key = parts[2]
+        value = env_manager.get_var(key)
+        if value is not None:
+            console.print(f"[cyan]{key}[/cyan] = {value}")
+        else:
+            console.print(f"[yellow]Variable {key} not found[/yellow]")
+        return 0, "", ""
+
+    def _env_set(
+        self, env_manager: EnvManager, parts: List[str]
+    ) -> Tuple[int, str, str]:
+        """Set an environment variable for this session."""
+        if len(parts) < 4:
+            return 1, "", "Usage: env set <key> <value>"
+
+        key = parts[2]
+        value = parts[3]
+        env_manager.set_var(key, value)
+        return 0, "", ""
+
+    def _env_llm(
+        self, env_manager: EnvManager, parts: List[str]
+    ) -> Tuple[int, str, str]:
+        """Show the LLM configuration for a provider."""
+        if len(parts) < 3:
+            providers = ["claude", "openai", "gemini", "ollama"]
+            console.print("Available providers: " + ", ".join(providers))
+            return 0, "", ""
 
-                env_manager.set_var("DEFAULT_LLM_PROVIDER", provider)
-                console.print(f"[green]Default LLM provider set to: {provider}[/green]")
-                console.print(
-                    "[dim]Note: This change affects current session only. Update .env to persist.[/dim]"
-                )
-                return 0, "", ""
+        provider = parts[2].lower()
+        config = env_manager.get_llm_config(provider)
 
-            elif subcommand == "mcp":
-                servers = env_manager.get_mcp_servers()
+        if not config:
+            return 1, "", f"Unknown provider: {provider}"
 
-                if not servers:
-                    console.print("[yellow]No MCP servers configured[/yellow]")
-                    console.print(
-                        "[dim]Configure servers in .env file with MCP_*_SERVER variables[/dim]"
-                    )
-                    return 0, "", ""
+        table = Table(title=f"{provider.title()} Configuration", show_header=True)
+        table.add_column("Setting", style="cyan")
+        table.add_column("Value", style="white")
 
-                from rich.table import Table
+        for key, value in config.items():
+            if value is None:
+                display_value = "[red]Not set[/red]"
+            elif key == "api_key":
+                # Mask sensitive values
+                if len(value) > 8:
+                    display_value = value[:4] + "..." + value[-4:]
+                else:
+                    display_value = "***"
+            else:
+                display_value = value
 
-                table = Table(title="Configured MCP Servers", show_header=True)
-                table.add_column("Name", style="cyan")
-                table.add_column("Command/URL", style="white")
+            table.add_row(key, display_value)
 
-                for name, command in servers.items():
-                    table.add_row(name.title(), command)
+        console.print(table)
+        return 0, "", ""
 
-                console.print(table)
-                return 0, "", ""
+    def _env_default(
+        self, env_manager: EnvManager, parts: List[str]
+    ) -> Tuple[int, str, str]:
+        """Show or set the default LLM provider."""
+        if len(parts) < 3:
+            current_default = env_manager.get_var("DEFAULT_LLM_PROVIDER", "claude")
+            console.print(
+                f"Current default LLM provider: [cyan]{current_default}[/cyan]"
+            )
+            console.print("Available providers: claude, openai, gemini, ollama")
+            console.print("Usage: env default <provider>")
+            return 0, "", ""
 
-            elif subcommand == "mcp-list":
-                available = env_manager.list_available_mcp_servers()
+        provider = parts[2].lower()
+        valid_providers = ["claude", "openai", "gemini", "ollama"]
 
-                from rich.table import Table
+        if provider not in valid_providers:
+            return (
+                1,
+                "",
+                f"Invalid provider: {provider}. Use: {', '.join(valid_providers)}",
+            )
 
-                table = Table(title="Available MCP Server Types", show_header=True)
-                table.add_column("Category", style="cyan")
-                table.add_column("Servers", style="white")
+        env_manager.set_var("DEFAULT_LLM_PROVIDER", provider)
+        console.print(f"[green]Default LLM provider set to: {provider}[/green]")
+        console.print(
+            "[dim]Note: This change affects current session only. Update .env to persist.[/dim]"
+        )
+        return 0, "", ""
 
-                categories = {
-                    "Database": ["postgres", "sqlite", "mysql"],
-                    "Version Control": ["github", "gitlab"],
-                    "Atlassian": ["jira", "atlassian"],
-                    "File/Web": ["filesystem", "fetch", "memory"],
-                    "Development": ["docker", "kubernetes"],
-                    "Cloud": ["aws", "gcp"],
-                    "Custom": ["custom_1", "custom_2"],
-                }
+    def _env_mcp(
+        self, env_manager: EnvManager, parts: List[str]
+    ) -> Tuple[int, str, str]:
+        """Show the configured MCP servers."""
+        servers = env_manager.get_mcp_servers()
 
-                for category, servers in categories.items():
-                    table.add_row(category, ", ".join(servers))
+        if not servers:
+            console.print("[yellow]No MCP servers configured[/yellow]")
+            console.print(
+                "[dim]Configure servers in .env file with MCP_*_SERVER variables[/dim]"
+            )
+            return 0, "", ""
 
-                console.print(table)
-                console.print(
-                    "\n[dim]Configure in .env as MCP_<NAME>_SERVER=<command>[/dim]"
-                )
-                console.print(
-                    "[dim]Example: MCP_POSTGRES_SERVER=npx -y @modelcontextprotocol/server-postgres postgresql://localhost/mydb[/dim]"
-                )
-                return 0, "", ""
+        table = Table(title="Configured MCP Servers", show_header=True)
+        table.add_column("Name", style="cyan")
+        table.add_column("Command/URL", style="white")
+
+        for name, command in servers.items():
+            table.add_row(name.title(), command)
+
+        console.print(table)
+        return 0, "", ""
+
+    def _env_mcp_list(
+        self, env_manager: EnvManager, parts: List[str]
+    ) -> Tuple[int, str, str]:
+        """List the MCP server types that can be configured."""
+        available = env_manager.list_available_mcp_servers()
+
+        table = Table(title="Available MCP Server Types", show_header=True)
+        table.add_column("Category", style="cyan")
+        table.add_column("Servers", style="white")
+
+        categories = {
+            "Database": ["postgres", "sqlite", "mysql"],
+            "Version Control": ["github", "gitlab"],
+            "Atlassian": ["jira", "atlassian"],
+            "File/Web": ["filesystem", "fetch", "memory"],
+            "Development": ["docker", "kubernetes"],
+            "Cloud": ["aws", "gcp"],
+            "Custom": ["custom_1", "custom_2"],
+        }
 
-            else:
-                return (
-                    1,
-                    "",
-                    f"Unknown subcommand: {subcommand}. Use: reload, show, get, set, llm, default, mcp, mcp-list",
-                )
+        for category, servers in categories.items():
+            table.add_row(category, ", ".join(servers))
 
-        except Exception as e:
-            return 1, "", f"Env error: {str(e)}"
+        console.print(table)
+        console.print("\n[dim]Configure in .env as MCP_<NAME>_SERVER=<command>[/dim]")
+        console.print(
+            "[dim]Example: MCP_POSTGRES_SERVER=npx -y @modelcontextprotocol/server-postgres postgresql://localhost/mydb[/dim]"
+        )
+        return 0, "", ""
 
     def _handle_chat(self, command: str) -> Tuple[int, str, str]:
         """Handle interactive multi-turn chat sessions."""
         try:
-            parts = shlex.split(command)
+            parts = _split_args(command)
 
             # Parse options
             provider_name = None
@@ -1332,7 +1794,6 @@ Examples:
                     i += 1
 
             # Default provider
-            env_manager = get_env_manager()
             valid_providers = ["claude", "openai", "ollama", "gemini"]
 
             if provider_name is None:
@@ -1346,27 +1807,7 @@ Examples:
             else:
                 provider_name = provider_name.lower()
 
-            # Get provider config
-            config = env_manager.get_llm_config(provider_name)
-
-            # Create LLM provider
-            if provider_name == "claude":
-                llm = ClaudeLLMProvider(
-                    api_key=config.get("api_key"),
-                    base_url=config.get("base_url"),
-                )
-            elif provider_name == "openai":
-                llm = OpenAILLMProvider(
-                    api_key=config.get("api_key"),
-                    base_url=config.get("base_url"),
-                )
-            elif provider_name == "ollama":
-                llm = OllamaLLMProvider(base_url=config.get("base_url"))
-            elif provider_name == "gemini":
-                llm = GeminiLLMProvider(
-                    api_key=config.get("api_key"),
-                    base_url=config.get("base_url"),
-                )
+            llm = self._get_provider(provider_name)
 
             model_name = llm.default_model
 
@@ -1491,7 +1932,7 @@ Examples:
                         console.print("\n[dim]Conversation ended.[/dim]")
                         break
 
-            asyncio.run(run_chat_loop())
+            self._run_async(run_chat_loop())
             return 0, "", ""
 
         except Exception as e:
@@ -1,5 +1,11 @@
+import atexit
+import importlib.util
+import json
 import os
-from typing import Optional, Dict, Any
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
 from abc import ABC, abstractmethod
 
 from rich.console import Console
@@ -24,12 +30,19 @@ class ClaudeNLConverter(NLConverter):
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable must be set")
         
-        # Import here to avoid dependency if not using Claude
-        try:
-            import anthropic
-            self.client = anthropic.Anthropic(api_key=self.api_key)
-        except ImportError:
+        # The SDK takes about a second to import, so only check it is
+        # installed here and create the client on the first conversion
+        if importlib.util.find_spec("anthropic") is None:
             raise ImportError("Please install anthropic: pip install anthropic")
+        self._client = None
+
+    @property
+    def client(self):
+        """The Anthropic client, created on first use."""
+        if self._client is None:
+            import anthropic
+            self._client = anthropic.Anthropic(api_key=self.api_key)
+        return self._client
     
     def convert(self, nl_input: str, context: Dict[str, Any]) -> Optional[str]:
         """Convert natural language to shell command using Claude."""
@@ -70,9 +83,11 @@ Command:"""
 class OllamaNLConverter(NLConverter):
     """Convert natural language to shell commands using Ollama (local LLM)."""
     
-    def __init__(self, model: str = "llama2", base_url: str = "http://localhost:11434"):
+    def __init__(self, model: str = "llama2", base_url: str = "http://localhost:11434",
+                 timeout: float = 60):
         self.model = model
         self.base_url = base_url
+        self.timeout = timeout
         
         # Import here to avoid dependency if not using Ollama
         try:
@@ -80,6 +95,8 @@ class OllamaNLConverter(NLConverter):
             self.requests = requests
         except ImportError:
             raise ImportError("Please install requests: pip install requests")
+        # One session for all conversions, so the connection is kept alive
+        self.session = requests.Session()
     
     def convert(self, nl_input: str, context: Dict[str, Any]) -> Optional[str]:
         """Convert natural language to shell command using Ollama."""
@@ -101,7 +118,7 @@ Request: {nl_input}
 
 Command:"""
             
-            response = self.requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": self.model,
@@ -109,7 +126,8 @@ Command:"""
                     "stream": False,
                     "temperature": 0,
                     "max_tokens": 200,
-                }
+                },
+                timeout=self.timeout,
             )
             
             if response.status_code == 200:
@@ -130,35 +148,123 @@ Command:"""
 
 class MockNLConverter(NLConverter):
     """Mock converter for testing without API access."""
-    
+
+    # Checked in order; the first phrase found anywhere in the request wins
+    _COMMANDS = (
+        ("list files", "ls -la"),
+        ("show files", "ls"),
+        ("current directory", "pwd"),
+        ("go home", "cd ~"),
+        ("go back", "cd .."),
+        ("clear screen", "clear"),
+        ("show history", "history"),
+        ("disk usage", "df -h"),
+        ("memory usage", "free -h"),
+        ("running processes", "ps aux"),
+        ("network connections", "netstat -an"),
+        ("find", lambda text: f"find . -name '*{text.split('find')[-1].strip()}*'"),
+        ("search for", lambda text: f"grep -r '{text.split('search for')[-1].strip()}' ."),
+        ("create directory", lambda text: f"mkdir {text.split('directory')[-1].strip()}"),
+        ("delete", lambda text: f"rm {text.split('delete')[-1].strip()}"),
+    )
+    # Each alternative scans the whole request, so alternation order keeps
+    # the priority above; group p<i> names the matching entry
+    _PATTERN = re.compile(
+        "|".join(f".*?(?P<p{i}>{re.escape(phrase)})" for i, (phrase, _) in enumerate(_COMMANDS)),
+        re.DOTALL,
+    )
+
     def convert(self, nl_input: str, context: Dict[str, Any]) -> Optional[str]:
         """Simple pattern matching for common requests."""
-        nl_lower = nl_input.lower()
-        
-        # Simple pattern matching
-        patterns = {
-            "list files": "ls -la",
-            "show files": "ls",
-            "current directory": "pwd",
-            "go home": "cd ~",
-            "go back": "cd ..",
-            "clear screen": "clear",
-            "show history": "history",
-            "disk usage": "df -h",
-            "memory usage": "free -h",
-            "running processes": "ps aux",
-            "network connections": "netstat -an",
-            "find": f"find . -name '*{nl_input.split('find')[-1].strip()}*'" if 'find' in nl_lower else None,
-            "search for": f"grep -r '{nl_input.split('search for')[-1].strip()}' ." if 'search for' in nl_lower else None,
-            "create directory": f"mkdir {nl_input.split('directory')[-1].strip()}" if 'directory' in nl_lower else None,
-            "delete": f"rm {nl_input.split('delete')[-1].strip()}" if 'delete' in nl_lower else None,
-        }
-        
-        for pattern, command in patterns.items():
-            if pattern in nl_lower and command:
-                return command
-        
-        return None
+        match = self._PATTERN.match(nl_input.lower())
+        if match is None:
+            return None
+        command = self._COMMANDS[int(match.lastgroup[1:])][1]
+        return command(nl_input) if callable(command) else command
+
+
+# Sentence punctuation trailing a word; anything inside a word is kept
+_TRAILING_PUNCTUATION = ".,?!"
+
+
+class NLCommandCache:
+    """LRU cache of converted commands, optionally persisted as JSON.
+
+    Conversions are LLM round-trips and users repeat the same requests, so
+    answers are keyed by the normalized request and OS. The working directory
+    is deliberately left out so that entries carry across directories.
+    Requests that differ only in case, spacing or trailing punctuation
+    ("Show disk usage?" / "show disk usage") share an entry. Every word is
+    kept in order, since any of them may be an operand: "delete file a" and
+    "delete file i" are different commands.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None, max_entries: int = 512):
+        self.cache_file = Path(cache_file).expanduser() if cache_file else None
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._loaded = False
+        self._save_registered = False
+
+    @staticmethod
+    def _normalize(nl_input: str) -> str:
+        words = (
+            word.rstrip(_TRAILING_PUNCTUATION) or word
+            for word in nl_input.lower().split()
+        )
+        return " ".join(words)
+
+    def _load(self):
+        """Read persisted entries on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            for os_name, text, command in json.loads(
+                self.cache_file.read_text(encoding="utf-8")
+            ):
+                # Files written by older versions used a looser normalization
+                self._store(os_name, self._normalize(text), command)
+        except (OSError, ValueError, TypeError):
+            # A corrupt cache is just a cold cache
+            self._entries.clear()
+
+    def _store(self, os_name: str, text: str, command: str):
+        key = (os_name, text)
+        self._entries[key] = command
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, nl_input: str, os_name: str) -> Optional[str]:
+        """Return the cached command for a request, or None on a miss."""
+        self._load()
+        key = (os_name, self._normalize(nl_input))
+        command = self._entries.get(key)
+        if command is not None:
+            self._entries.move_to_end(key)
+        return command
+
+    def put(self, nl_input: str, os_name: str, command: str):
+        """Remember the command a request converted to."""
+        self._load()
+        self._store(os_name, self._normalize(nl_input), command)
+
+        if self.cache_file is not None and not self._save_registered:
+            self._save_registered = True
+            atexit.register(self.save)
+
+    def save(self):
+        """Write entries to the cache file."""
+        if self.cache_file is None:
+            return
+        data = [[os_name, text, command] for (os_name, text), command in self._entries.items()]
+        try:
+            self.cache_file.write_text(json.dumps(data), encoding="utf-8")
+        except OSError:
+            pass
 
 
 def get_nl_converter(provider: str = "claude", **kwargs) -> NLConverter:
@@ -170,4 +276,4 @@ def get_nl_converter(provider: str = "claude", **kwargs) -> NLConverter:
     elif provider == "mock":
         return MockNLConverter(**kwargs)
     else:
-        raise ValueError(f"Unknown provider: {provider}")
\ No newline at end of file
+        raise ValueError(f"Unknown provider: {provider}")
@@ -3,9 +3,13 @@
 from .transcript import LLMTranscriptManager, get_transcript_manager
 from .env_manager import EnvManager, get_env_manager, load_env_on_startup
 from .mcp_discovery import MCPCapabilityManager, get_mcp_capability_manager
+from .stream_output import StreamPrinter, response_renderable
+from .event_loop import install_uvloop
 
 __all__ = [
     'LLMTranscriptManager', 'get_transcript_manager',
     'EnvManager', 'get_env_manager', 'load_env_on_startup',
-    'MCPCapabilityManager', 'get_mcp_capability_manager'
+    'MCPCapabilityManager', 'get_mcp_capability_manager',
+    'StreamPrinter', 'response_renderable',
+    'install_uvloop'
 ]
\ No newline at end of file
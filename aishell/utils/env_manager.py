@@ -1,6 +1,7 @@
 """Environment variable management for aishell."""
 
 import os
+import re
 from pathlib import Path
 from typing import Dict, Optional, List, Any
 import threading
@@ -8,6 +9,16 @@ from rich.console import Console
 
 console = Console()
 
+# KEY=VALUE lines, skipping blanks and comments; surrounding whitespace is
+# dropped from both parts
+_ENV_ASSIGNMENT_RE = re.compile(
+    r"^[^\S\n]*([^#\s=][^=\n]*?)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.MULTILINE
+)
+# Non-comment lines without an '='
+_ENV_INVALID_LINE_RE = re.compile(r"^[^\S\n]*([^#\s=][^=\n]*?)[^\S\n]*$", re.MULTILINE)
+# Variable names whose values are masked by show_env
+_SENSITIVE_KEY_RE = re.compile(r"key|token|secret|password|auth", re.IGNORECASE)
+
 
 class EnvManager:
     """Manages environment variables and .env file loading."""
@@ -16,11 +27,23 @@ class EnvManager:
         self.env_file = Path(env_file).resolve()
         self._lock = threading.Lock()
         self._loaded_vars: Dict[str, str] = {}
+        # MCP_<NAME>_SERVER variables from the .env file, by lowercased name
+        self._mcp_servers: Dict[str, str] = {}
+        # mtime of the .env file when it was last parsed
+        self._mtime_ns: Optional[int] = None
+
+    def load_env(self, verbose: bool = True, force: bool = False) -> bool:
+        """Load environment variables from .env file.
 
-    def load_env(self, verbose: bool = True) -> bool:
-        """Load environment variables from .env file."""
+        The file is not parsed again while its mtime is unchanged, unless
+        ``force`` is set.
+        """
         with self._lock:
-            if not self.env_file.exists():
+            try:
+                mtime_ns = self.env_file.stat().st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if mtime_ns is None:
                 if verbose:
                     console.print(
                         f"[yellow]No .env file found at {self.env_file}[/yellow]"
@@ -30,43 +53,54 @@ class EnvManager:
                     )
                 return False
 
+            if not force and mtime_ns == self._mtime_ns and self._loaded_vars:
+                if verbose:
+                    console.print(
+                        f"[green]Loaded {len(self._loaded_vars)} environment variables from {self.env_file.name}[/green]"
+                    )
+                return True
+
             try:
+                text = self.env_file.read_text(encoding="utf-8")
+
+                loaded: Dict[str, str] = {}
+                mcp_servers: Dict[str, str] = {}
                 loaded_count = 0
-                with open(self.env_file, "r", encoding="utf-8") as f:
-                    for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-
-                        # Skip empty lines and comments
-                        if not line or line.startswith("#"):
-                            continue
-
-                        # Parse KEY=VALUE format
-                        if "=" in line:
-                            key, value = line.split("=", 1)
-                            key = key.strip()
-                            value = value.strip()
-
-                            # Remove quotes if present
-                            if value.startswith('"') and value.endswith('"'):
-                                value = value[1:-1]
-                            elif value.startswith("'") and value.endswith("'"):
-                                value = value[1:-1]
-
-                            # Set environment variable
-                            os.environ[key] = value
-                            self._loaded_vars[key] = value
-                            loaded_count += 1
+                for key, value in _ENV_ASSIGNMENT_RE.findall(text):
+                    # Remove quotes if present
+                    if value[:1] in ('"', "'") and value.endswith(value[0]):
+                        value = value[1:-1]
+
+                    loaded[key] = value
+                    loaded_count += 1
+
+                    if key.startswith("MCP_") and key.endswith("_SERVER"):
+                        # Convert MCP_POSTGRES_SERVER to 'postgres'
+                        server_name = key[4:-7].lower()
+                        if value:
+                            mcp_servers[server_name] = value
                         else:
-                            if verbose:
-                                console.print(
-                                    f"[yellow]Warning: Invalid line {line_num} in .env file: {line}[/yellow]"
-                                )
+                            mcp_servers.pop(server_name, None)
+
+                # Apply the whole file at once; the previous dicts are
+                # replaced, not mutated, so reload_env can diff against them
+                os.environ.update(loaded)
+                self._loaded_vars = loaded
+                self._mcp_servers = mcp_servers
+
+                if verbose:
+                    for match in _ENV_INVALID_LINE_RE.finditer(text):
+                        line_num = text.count("\n", 0, match.start()) + 1
+                        console.print(
+                            f"[yellow]Warning: Invalid line {line_num} in .env file: {match.group(1)}[/yellow]"
+                        )
 
                 if verbose:
                     console.print(
                         f"[green]Loaded {loaded_count} environment variables from {self.env_file.name}[/green]"
                     )
 
+                self._mtime_ns = mtime_ns
                 return True
 
             except Exception as e:
@@ -79,24 +113,22 @@ class EnvManager:
         if verbose:
             console.print("[blue]Reloading environment variables...[/blue]")
 
-        # Store old values for comparison
-        old_vars = dict(self._loaded_vars)
+        # load_env replaces the dict, so this keeps the old values
+        old_vars = self._loaded_vars
 
         # Load new values
-        success = self.load_env(verbose=False)
+        success = self.load_env(verbose=False, force=True)
 
         if success and verbose:
             # Show what changed
-            new_vars = set(self._loaded_vars.keys())
-            old_vars_set = set(old_vars.keys())
-
-            added = new_vars - old_vars_set
-            removed = old_vars_set - new_vars
-            modified = []
-
-            for key in new_vars & old_vars_set:
-                if self._loaded_vars[key] != old_vars.get(key):
-                    modified.append(key)
+            new_vars = self._loaded_vars
+            added = new_vars.keys() - old_vars.keys()
+            removed = old_vars.keys() - new_vars.keys()
+            modified = [
+                key
+                for key in new_vars.keys() & old_vars.keys()
+                if new_vars[key] != old_vars[key]
+            ]
 
             if added:
                 console.print(
@@ -130,14 +162,14 @@ class EnvManager:
         table.add_column("Variable", style="cyan", width=25)
         table.add_column("Value", style="white", no_wrap=False)
 
+        filter_lower = filter_pattern.lower() if filter_pattern else None
         for key, value in sorted(self._loaded_vars.items()):
-            if filter_pattern and filter_pattern.lower() not in key.lower():
+            if filter_lower and filter_lower not in key.lower():
                 continue
 
             # Mask sensitive values
             display_value = value
-            sensitive_keys = ["key", "token", "secret", "password", "auth"]
-            if any(sensitive in key.lower() for sensitive in sensitive_keys):
+            if _SENSITIVE_KEY_RE.search(key):
                 if len(value) > 8:
                     display_value = value[:4] + "..." + value[-4:]
                 else:
@@ -206,18 +238,7 @@ class EnvManager:
 
     def get_mcp_servers(self) -> Dict[str, str]:
         """Get configured MCP servers from environment."""
-        servers = {}
-
-        # Get all environment variables that start with MCP_
-        for key, value in self._loaded_vars.items():
-            if key.startswith("MCP_") and key.endswith("_SERVER") and value:
-                # Convert MCP_POSTGRES_SERVER to 'postgres'
-                server_name = key[
-                    4:-7
-                ].lower()  # Remove 'MCP_' prefix and '_SERVER' suffix
-                servers[server_name] = value
-
-        return servers
+        return dict(self._mcp_servers)
 
     def list_available_mcp_servers(self) -> List[str]:
         """List all available MCP server types from .env.example."""
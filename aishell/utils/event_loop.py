@@ -0,0 +1,21 @@
+"""Event loop selection."""
+
+import asyncio
+
+
+def install_uvloop() -> bool:
+    """Use uvloop for new event loops if it is installed.
+
+    uvloop is optional and not available on Windows. Once installed as the
+    policy, ``asyncio.run`` and ``asyncio.new_event_loop`` both return
+    uvloop loops.
+
+    Returns:
+        True if uvloop is in use
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
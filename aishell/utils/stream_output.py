@@ -0,0 +1,60 @@
+"""Console output helpers for LLM responses."""
+
+from typing import List
+
+from rich.console import Console, RenderableType
+from rich.text import Text
+
+
+def response_renderable(content: str) -> RenderableType:
+    """Wrap LLM response text for display in a Panel.
+
+    A plain string handed to Rich is scanned for markup and highlighted,
+    which is slow on long responses and mangles bracketed text. Plain
+    responses become a ``Text``; Markdown rendering is only used when the
+    response contains a fenced code block.
+    """
+    if "```" in content:
+        # rich.markdown pulls in pygments; only pay for it when needed
+        from rich.markdown import Markdown
+
+        return Markdown(content)
+    return Text(content)
+
+
+class StreamPrinter:
+    """Print streamed chunks in batches and collect the full response.
+
+    Providers often yield a few characters at a time, and every
+    ``console.print`` takes Rich's lock and flushes the terminal. Chunks are
+    held until ``flush_at`` characters or a newline arrive, which keeps the
+    output looking live while cutting writes by an order of magnitude.
+    """
+
+    def __init__(self, console: Console, flush_at: int = 256):
+        self.console = console
+        self.flush_at = flush_at
+        self._chunks: List[str] = []
+        self._pending: List[str] = []
+        self._pending_len = 0
+
+    def write(self, chunk: str):
+        """Add a chunk, printing the pending text if the batch is full."""
+        self._chunks.append(chunk)
+        self._pending.append(chunk)
+        self._pending_len += len(chunk)
+        if self._pending_len >= self.flush_at or "\n" in chunk:
+            self.flush()
+
+    def flush(self):
+        """Print any pending text."""
+        if self._pending:
+            # Model output is plain text; brackets in it are not Rich markup
+            self.console.print("".join(self._pending), end="", markup=False)
+            self._pending.clear()
+            self._pending_len = 0
+
+    @property
+    def text(self) -> str:
+        """Everything written so far."""
+        return "".join(self._chunks)
@@ -1,10 +1,58 @@
 """LLM transcript logging functionality."""
 
+import atexit
+import io
 import os
+import queue
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Protocol, Tuple, Union
 import threading
+import time
+
+
+# Entry layouts; each entry is formatted in one go and written with one call
+_HEADER_TMPL = "**{timestamp} | {provider}{model_suffix}**\n\n**Query:** {query}\n\n"
+_ENTRY_TMPL = _HEADER_TMPL + "**Response:**\n{response}\n\n{usage_block}---\n"
+_FAILED_ENTRY_TMPL = (
+    _HEADER_TMPL
+    + "**Response:** Failed (see log with timestamp {timestamp})\n\n---\n"
+)
+_ERROR_ENTRY_TMPL = _HEADER_TMPL + "**Error:** {error}\n\n---\n"
+
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+
+class _ResponseLike(Protocol):
+    """What collation results look like; ``LLMResponse`` satisfies it."""
+
+    is_error: bool
+    error: Optional[str]
+    content: str
+    usage: Optional[dict]
+    model: Optional[str]
+
+
+# (epoch second, formatted) for the last timestamp handed out
+_ts_cache: Tuple[int, str] = (0, "")
+
+
+def _now_str() -> str:
+    """Current local time as an entry timestamp, formatted once per second."""
+    global _ts_cache
+    now = int(time.time())
+    if _ts_cache[0] != now:
+        _ts_cache = (now, datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S"))
+    return _ts_cache[1]
+
+
+def _model_suffix(model: Optional[str]) -> str:
+    return f" ({model})" if model else ""
+
+
+def _format_usage(usage: dict) -> str:
+    return ", ".join(f"{k}: {v}" for k, v in usage.items())
 
 
 class LLMTranscriptManager:
@@ -17,8 +65,96 @@ class LLMTranscriptManager:
     ):
         self.transcript_file = Path(transcript_file).resolve()
         self.error_file = Path(error_file).resolve()
-        self._lock = threading.Lock()
         self._ensure_files_exist()
+        self._fds = {
+            path: os.open(path, _APPEND_FLAGS, 0o644)
+            for path in (self.transcript_file, self.error_file)
+        }
+
+        # Entries are written by one background thread so logging never
+        # waits on the disk; items are (path, text), a flush Event, or None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Guards _closed so no entry is queued behind the writer's stop marker
+        self._lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="transcript-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+    def flush(self):
+        """Block until everything logged so far has been written."""
+        done = threading.Event()
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Write pending entries and close the transcript and error files."""
+        atexit.unregister(self.close)
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._writer.join()
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+    def _append(self, path: Path, text: str):
+        """Queue text to be appended to the transcript or error file."""
+        with self._lock:
+            if not self._closed:
+                self._queue.put((path, text))
+                return
+
+        # Logged after close(), e.g. from another atexit handler
+        with open(path, "a", encoding="utf-8", errors="replace") as f:
+            f.write(text)
+
+    def _writer_loop(self):
+        while True:
+            # Block for one item, then take whatever else is already queued
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            pending = {}
+            waiters = []
+            stop = False
+            for item in items:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    pending.setdefault(item[0], []).append(item[1])
+
+            for path, texts in pending.items():
+                try:
+                    self._write_all(self._fds[path], "".join(texts))
+                except Exception:
+                    # A full disk or a bad entry shouldn't stop later logging
+                    pass
+
+            for done in waiters:
+                done.set()
+            if stop:
+                return
+
+    @staticmethod
+    def _write_all(fd: int, text: str):
+        # Model output can hold lone surrogates, which strict UTF-8 rejects
+        view = memoryview(text.encode("utf-8", errors="replace"))
+        while view:
+            view = view[os.write(fd, view):]
 
     def _ensure_files_exist(self):
         """Ensure the transcript and error files exist with proper headers."""
@@ -48,21 +184,15 @@ class LLMTranscriptManager:
         model: Optional[str] = None,
     ):
         """Log error details to the error file."""
-        entry_lines = [
-            f"**{timestamp} | {provider.upper()}"
-            + (f" ({model})" if model else "")
-            + "**",
-            "",
-            f"**Query:** {query}",
-            "",
-            f"**Error:** {error}",
-            "",
-            "---",
-            "",
-        ]
-
-        with open(self.error_file, "a", encoding="utf-8") as f:
-            f.write("\n".join(entry_lines))
+        entry = _ERROR_ENTRY_TMPL.format(
+            timestamp=timestamp,
+            provider=provider.upper(),
+            model_suffix=_model_suffix(model),
+            query=query,
+            error=error,
+        )
+
+        self._append(self.error_file, entry)
 
     def log_interaction(
         self,
@@ -74,133 +204,93 @@ class LLMTranscriptManager:
         error: Optional[str] = None,
     ):
         """Log a single LLM interaction to the transcript."""
-        with self._lock:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            # Handle errors
-            if error:
-                # Log error details to error file
-                self._log_error(timestamp, query, error, provider, model)
-
-                # Log brief error reference in transcript
-                entry_lines = [
-                    f"**{timestamp} | {provider.upper()}"
-                    + (f" ({model})" if model else "")
-                    + "**",
-                    "",
-                    f"**Query:** {query}",
-                    "",
-                    f"**Response:** Failed (see log with timestamp {timestamp})",
-                    "",
-                    "---",
-                    "",
-                ]
-            else:
-                # Build the successful log entry
-                entry_lines = [
-                    f"**{timestamp} | {provider.upper()}"
-                    + (f" ({model})" if model else "")
-                    + "**",
-                    "",
-                    f"**Query:** {query}",
-                    "",
-                    f"**Response:**",
-                    response,
-                    "",
-                ]
-
-                # Add usage information if available
-                if usage:
-                    usage_str = ", ".join([f"{k}: {v}" for k, v in usage.items()])
-                    entry_lines.extend([f"**Usage:** {usage_str}", ""])
+        timestamp = _now_str()
 
-                entry_lines.extend(["---", ""])
+        if error:
+            # Details go to the error file; the transcript gets a reference
+            self._log_error(timestamp, query, error, provider, model)
+            entry = _FAILED_ENTRY_TMPL.format(
+                timestamp=timestamp,
+                provider=provider.upper(),
+                model_suffix=_model_suffix(model),
+                query=query,
+            )
+        else:
+            entry = _ENTRY_TMPL.format(
+                timestamp=timestamp,
+                provider=provider.upper(),
+                model_suffix=_model_suffix(model),
+                query=query,
+                response=response,
+                usage_block=(
+                    f"**Usage:** {_format_usage(usage)}\n\n" if usage else ""
+                ),
+            )
 
-            # Append to transcript file
-            with open(self.transcript_file, "a", encoding="utf-8") as f:
-                f.write("\n".join(entry_lines))
+        self._append(self.transcript_file, entry)
 
     def log_multi_interaction(
-        self, query: str, responses: List[tuple], timestamp: Optional[str] = None
+        self,
+        query: str,
+        responses: List[Tuple[str, Union[_ResponseLike, str]]],
+        timestamp: Optional[str] = None,
     ):
         """Log a multi-LLM interaction (collation) to the transcript."""
-        with self._lock:
-            if not timestamp:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            providers_list = [provider for provider, _ in responses]
-            providers_str = ", ".join(providers_list)
-
-            entry_lines = [
-                f"**{timestamp} | COLLATION ({providers_str})**",
-                "",
-                f"**Query:** {query}",
-                "",
-                f"**Responses:**",
-                "",
-            ]
-
-            # Add each response
-            for provider, response_data in responses:
-                entry_lines.extend([f"### {provider.upper()}", ""])
-
-                if hasattr(response_data, "is_error") and response_data.is_error:
-                    # Log error details to error file
-                    error_msg = (
-                        response_data.error
-                        if hasattr(response_data, "error")
-                        else str(response_data)
-                    )
-                    model = (
-                        response_data.model if hasattr(response_data, "model") else None
-                    )
-                    self._log_error(timestamp, query, error_msg, provider, model)
-
-                    # Add brief error reference in transcript
-                    entry_lines.extend(
-                        [f"Failed (see log with timestamp {timestamp})", ""]
-                    )
-                else:
-                    content = (
-                        response_data.content
-                        if hasattr(response_data, "content")
-                        else str(response_data)
-                    )
-                    entry_lines.extend([content, ""])
-
-                    # Add usage if available
-                    if hasattr(response_data, "usage") and response_data.usage:
-                        usage_str = ", ".join(
-                            [f"{k}: {v}" for k, v in response_data.usage.items()]
-                        )
-                        entry_lines.extend([f"*Usage: {usage_str}*", ""])
-
-            entry_lines.append("---")
-            entry_lines.append("")
-
-            # Append to transcript file
-            with open(self.transcript_file, "a", encoding="utf-8") as f:
-                f.write("\n".join(entry_lines))
+        if not timestamp:
+            timestamp = _now_str()
+
+        providers_str = ", ".join(provider for provider, _ in responses)
+
+        buf = io.StringIO()
+        buf.write(
+            f"**{timestamp} | COLLATION ({providers_str})**\n\n"
+            f"**Query:** {query}\n\n**Responses:**\n\n"
+        )
+
+        # Add each response
+        for provider, response_data in responses:
+            buf.write(f"### {provider.upper()}\n\n")
+
+            # Results may also be plain strings, so fall back per attribute
+            if getattr(response_data, "is_error", False):
+                # Log error details to error file
+                self._log_error(
+                    timestamp,
+                    query,
+                    getattr(response_data, "error", response_data),
+                    provider,
+                    getattr(response_data, "model", None),
+                )
+
+                # Add brief error reference in transcript
+                buf.write(f"Failed (see log with timestamp {timestamp})\n\n")
+            else:
+                content = getattr(response_data, "content", response_data)
+                buf.write(f"{content}\n\n")
+
+                # Add usage if available
+                usage = getattr(response_data, "usage", None)
+                if usage:
+                    buf.write(f"*Usage: {_format_usage(usage)}*\n\n")
+
+        buf.write("---\n")
+
+        self._append(self.transcript_file, buf.getvalue())
 
     def get_transcript_path(self) -> str:
         """Get the full path to the transcript file."""
         return str(self.transcript_file)
 
 
-# Global transcript manager instance
-_transcript_manager = None
+# Logs go to the outputs/ dir relative to the project root
+_OUTPUTS_DIR = Path(__file__).resolve().parent.parent.parent / "outputs"
 
 
+@lru_cache(maxsize=None)
 def get_transcript_manager() -> LLMTranscriptManager:
     """Get or create the global transcript manager instance."""
-    global _transcript_manager
-    if _transcript_manager is None:
-        # Write logs to outputs/ dir relative to project root
-        project_root = Path(__file__).resolve().parent.parent.parent
-        outputs_dir = project_root / "outputs"
-        outputs_dir.mkdir(exist_ok=True)
-        _transcript_manager = LLMTranscriptManager(
-            transcript_file=str(outputs_dir / "LLMTranscript.md"),
-            error_file=str(outputs_dir / "LLMErrors.md"),
-        )
-    return _transcript_manager
+    _OUTPUTS_DIR.mkdir(exist_ok=True)
+    return LLMTranscriptManager(
+        transcript_file=str(_OUTPUTS_DIR / "LLMTranscript.md"),
+        error_file=str(_OUTPUTS_DIR / "LLMErrors.md"),
+    )
@@ -0,0 +1,16 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from aishell.utils import transcript
+
+
+@pytest.fixture(autouse=True)
+def isolated_transcript(tmp_path, monkeypatch):
+    """Keep LLM transcripts written during tests out of the repo's outputs/."""
+    monkeypatch.setattr(transcript, "_OUTPUTS_DIR", tmp_path / "outputs")
+    transcript.get_transcript_manager.cache_clear()
+    yield
+    if transcript.get_transcript_manager.cache_info().currsize:
+        transcript.get_transcript_manager().close()
+    transcript.get_transcript_manager.cache_clear()
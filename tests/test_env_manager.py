@@ -142,6 +142,113 @@ class TestEnvManager:
             assert os.environ.get('VALID_KEY') == 'valid_value'
             assert os.environ.get('ANOTHER_VALID') == 'another_value'
 
+    def test_env_file_whitespace_and_invalid_lines(self):
+        """Test parsing of padded assignments and warnings for invalid lines."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env_file = Path(tmpdir) / ".env"
+            env_file.write_text(
+                "  # KEY=commented\n"
+                "  PADDED_KEY =  padded value \n"
+                "URL_KEY=a=b\n"
+                "NOT AN ASSIGNMENT\n"
+            )
+
+            manager = EnvManager(str(env_file))
+            with patch('aishell.utils.env_manager.console') as mock_console:
+                assert manager.load_env(verbose=True) is True
+
+            assert manager._loaded_vars == {
+                'PADDED_KEY': 'padded value',
+                'URL_KEY': 'a=b',
+            }
+            printed = [c.args[0] for c in mock_console.print.call_args_list]
+            assert any("Invalid line 4" in p and "NOT AN ASSIGNMENT" in p for p in printed)
+
+    def test_reload_env_reports_changes(self):
+        """Test that reload_env reports added, removed and modified variables."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env_file = Path(tmpdir) / ".env"
+            env_file.write_text("RELOAD_KEPT=1\nRELOAD_CHANGED=a\nRELOAD_DROPPED=x\n")
+            manager = EnvManager(str(env_file))
+            manager.load_env(verbose=False)
+
+            env_file.write_text("RELOAD_KEPT=1\nRELOAD_CHANGED=b\nRELOAD_ADDED=y\n")
+            with patch('aishell.utils.env_manager.console') as mock_console:
+                assert manager.reload_env(verbose=True) is True
+
+            printed = "\n".join(c.args[0] for c in mock_console.print.call_args_list)
+            assert "Added variables: RELOAD_ADDED" in printed
+            assert "Removed variables: RELOAD_DROPPED" in printed
+            assert "Modified variables: RELOAD_CHANGED" in printed
+            assert "RELOAD_DROPPED" not in manager._loaded_vars
+
+    def test_get_mcp_servers(self):
+        """Test that MCP servers are indexed while the file is parsed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env_file = Path(tmpdir) / ".env"
+            env_file.write_text(
+                "MCP_POSTGRES_SERVER=http://localhost:8001\n"
+                "MCP_GITHUB_SERVER=\n"
+                "MCP_TIMEOUT=30\n"
+            )
+            manager = EnvManager(str(env_file))
+            manager.load_env(verbose=False)
+
+            servers = manager.get_mcp_servers()
+            assert servers == {'postgres': 'http://localhost:8001'}
+            servers['jira'] = 'mutated'
+            assert 'jira' not in manager.get_mcp_servers()
+
+            env_file.write_text(
+                "MCP_POSTGRES_SERVER=\nMCP_GITHUB_SERVER=http://localhost:8002\n"
+            )
+            manager.reload_env(verbose=False)
+            assert manager.get_mcp_servers() == {'github': 'http://localhost:8002'}
+
+    def test_show_env_masks_sensitive_values(self):
+        """Test that show_env masks secrets and applies the filter."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env_file = Path(tmpdir) / ".env"
+            env_file.write_text(
+                "SHOW_API_KEY=abcdefghijkl\nSHOW_Password=short\nSHOW_MODEL=gpt\nOTHER=x\n"
+            )
+            manager = EnvManager(str(env_file))
+            manager.load_env(verbose=False)
+
+            with patch('aishell.utils.env_manager.console') as mock_console:
+                manager.show_env("show")
+
+            table = mock_console.print.call_args.args[0]
+            rows = dict(zip(table.columns[0]._cells, table.columns[1]._cells))
+            assert rows == {
+                'SHOW_API_KEY': 'abcd...ijkl',
+                'SHOW_MODEL': 'gpt',
+                'SHOW_Password': '***',
+            }
+
+    def test_unchanged_env_file_not_reparsed(self):
+        """Test that load_env skips parsing while the file's mtime is unchanged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env_file = Path(tmpdir) / ".env"
+            env_file.write_text("CACHED_KEY=first\n")
+
+            manager = EnvManager(str(env_file))
+            assert manager.load_env(verbose=False) is True
+
+            with patch.object(Path, 'read_text', side_effect=AssertionError("re-read")):
+                assert manager.load_env(verbose=False) is True
+
+            env_file.write_text("CACHED_KEY=second\n")
+            stat = env_file.stat()
+            os.utime(env_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            manager.load_env(verbose=False)
+            assert os.environ.get('CACHED_KEY') == 'second'
+
+            # reload_env always re-reads the file
+            os.environ['CACHED_KEY'] = 'changed'
+            manager.reload_env(verbose=False)
+            assert os.environ.get('CACHED_KEY') == 'second'
+
 
 class TestShellEnvCommand:
     """Test the shell env command."""
@@ -166,6 +273,40 @@ class TestShellEnvCommand:
         assert exit_code == 1
         assert "Unknown subcommand" in stderr
 
+    def test_env_subcommands_dispatch(self, monkeypatch):
+        """Test that env subcommands reach their handlers."""
+        from aishell.shell.intelligent_shell import IntelligentShell
+
+        monkeypatch.setenv("ENV_DISPATCH_KEY", "v1")
+        shell = IntelligentShell(nl_provider='mock')
+        env = shell._command_env()
+
+        with patch('aishell.shell.intelligent_shell.console') as mock_console:
+            assert shell.execute_command('env GET ENV_DISPATCH_KEY') == (0, "", "")
+            assert shell._command_env() is env
+            mock_console.print.assert_called_once_with("[cyan]ENV_DISPATCH_KEY[/cyan] = v1")
+
+            assert shell.execute_command('env get') == (1, "", "Usage: env get <key>")
+
+        with patch('aishell.utils.env_manager.console'):
+            assert shell.execute_command('env set ENV_DISPATCH_KEY v2')[0] == 0
+        assert shell._command_env()["ENV_DISPATCH_KEY"] == "v2"
+
+    def test_env_llm_masks_only_the_api_key(self, monkeypatch):
+        """Test env llm masks the API key but shows max_tokens."""
+        from aishell.shell.intelligent_shell import IntelligentShell
+
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant-1234567890")
+        monkeypatch.setenv("DEFAULT_MAX_TOKENS", "4096")
+        shell = IntelligentShell(nl_provider='mock')
+        with patch('aishell.shell.intelligent_shell.console') as mock_console:
+            assert shell.execute_command('env llm claude')[0] == 0
+
+        table = mock_console.print.call_args.args[0]
+        settings = dict(zip(table.columns[0]._cells, table.columns[1]._cells))
+        assert settings["api_key"] == "sk-a...7890"
+        assert settings["max_tokens"] == "4096"
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
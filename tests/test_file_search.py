@@ -0,0 +1,172 @@
+"""Tests for the native-tool file searcher."""
+
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from aishell.search.file_search import MacOSFileSearcher, format_date, format_size
+
+
+def _make_tree(base: Path) -> None:
+    """Create a small directory tree with a few files."""
+    (base / "src").mkdir()
+    (base / "src" / "main.py").write_text("print('hello')\n")
+    (base / "src" / "util.py").write_text("API_KEY = 'x'\n")
+    (base / "notes.txt").write_text("plain notes\n")
+
+
+def test_find_returns_plain_string_paths():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_tree(root)
+
+        searcher = MacOSFileSearcher()
+        results = searcher.search_files("*.py", path=str(root), use_spotlight=False)
+
+        names = sorted(r["name"] for r in results)
+        assert names == ["main.py", "util.py"]
+        for r in results:
+            assert isinstance(r["path"], str)
+            assert r["path"].endswith(r["name"])
+            assert r["is_dir"] is False
+            assert r["size"] > 0
+
+
+def test_find_content_pattern_collects_matches():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_tree(root)
+
+        searcher = MacOSFileSearcher()
+        results = searcher.search_files(
+            "*.py", path=str(root), content_pattern="api_key", use_spotlight=False
+        )
+
+        by_name = {r["name"]: r for r in results}
+        assert by_name["util.py"]["matches"] == [(1, "API_KEY = 'x'")]
+        assert by_name["main.py"]["matches"] == []
+
+
+def test_find_respects_max_results():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_tree(root)
+
+        searcher = MacOSFileSearcher()
+        results = searcher.search_files(
+            "*", path=str(root), max_results=2, use_spotlight=False
+        )
+
+        assert len(results) == 2
+
+
+def test_format_size_units():
+    assert format_size(0) == "0.0 B"
+    assert format_size(1023) == "1023.0 B"
+    assert format_size(1024) == "1.0 KB"
+    assert format_size(1536) == "1.5 KB"
+    assert format_size(5 * 1024**2) == "5.0 MB"
+    assert format_size(3 * 1024**4) == "3.0 TB"
+    assert format_size(2048 * 1024**5) == "2048.0 PB"
+
+
+def test_format_date_uses_supplied_now():
+    now = datetime(2026, 1, 10, 12, 0)
+
+    assert format_date(now - timedelta(minutes=5), now) == "5 minutes ago"
+    assert format_date(now - timedelta(hours=3), now) == "3 hours ago"
+    assert format_date(now - timedelta(days=1), now) == "yesterday"
+    assert format_date(now - timedelta(days=4), now) == "4 days ago"
+    assert format_date(datetime(2025, 12, 1, 9, 30), now) == "2025-12-01 09:30"
+
+
+def test_find_handles_newlines_in_file_names():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "odd\nname.log").write_text("x")
+
+        searcher = MacOSFileSearcher()
+        results = searcher.search_files("*.log", path=str(root), use_spotlight=False)
+
+        assert [r["name"] for r in results] == ["odd\nname.log"]
+
+
+def test_find_prunes_excluded_directories():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_tree(root)
+        (root / "node_modules" / "pkg").mkdir(parents=True)
+        (root / "node_modules" / "pkg" / "index.py").write_text("x")
+        (root / ".git").mkdir()
+        (root / ".git" / "hook.py").write_text("x")
+
+        searcher = MacOSFileSearcher()
+        results = searcher.search_files("*.py", path=str(root), use_spotlight=False)
+
+        assert sorted(r["name"] for r in results) == ["main.py", "util.py"]
+
+
+def test_output_timeout_covers_the_whole_run():
+    # Keeps printing well inside any per-read timeout, but never finishes
+    script = (
+        "import sys, time\n"
+        "while True:\n"
+        "    sys.stdout.write('/tmp/x\\0'); sys.stdout.flush(); time.sleep(0.05)\n"
+    )
+    searcher = MacOSFileSearcher()
+    with subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE) as process:
+        try:
+            with pytest.raises(subprocess.TimeoutExpired):
+                for _ in searcher._iter_output_paths(process, timeout=0.5):
+                    pass
+        finally:
+            process.kill()
+
+
+def test_slow_content_search_does_not_count_against_timeout():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_tree(root)
+        searcher = MacOSFileSearcher()
+        iter_paths = searcher._iter_output_paths
+
+        def slow_grep(path, pattern):
+            time.sleep(0.2)
+            return []
+
+        with patch.object(searcher, "_grep_content", side_effect=slow_grep), \
+             patch.object(searcher, "_iter_output_paths",
+                          lambda process: iter_paths(process, timeout=0.3)):
+            results = searcher.search_files(
+                "*.py", path=str(root), content_pattern="x", use_spotlight=False
+            )
+
+        assert sorted(r["name"] for r in results) == ["main.py", "util.py"]
+
+
+def test_timeout_keeps_results_collected_so_far():
+    with tempfile.TemporaryDirectory() as tmp:
+        found = Path(tmp) / "found.txt"
+        found.write_text("x")
+        # Reports one path, then stalls
+        script = (
+            "import sys, time\n"
+            f"sys.stdout.write({str(found)!r} + '\\0'); sys.stdout.flush()\n"
+            "time.sleep(30)\n"
+        )
+        searcher = MacOSFileSearcher()
+        iter_paths = searcher._iter_output_paths
+
+        with patch.object(searcher, "_iter_output_paths",
+                          lambda process: iter_paths(process, timeout=0.3)):
+            results = searcher._execute_search_command(
+                [sys.executable, "-c", script], max_results=10
+            )
+
+        assert [r["name"] for r in results] == ["found.txt"]
@@ -205,5 +205,22 @@ class TestCLIBasics:
         assert "Missing argument" in result.output or "Usage:" in result.output
 
 
+def test_cli_import_skips_playwright():
+    """Registering the scraping commands must not import Playwright."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    code = "import sys, aishell.cli; print('playwright' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert result.stdout.strip() == "False"
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,8 +1,22 @@
 """Tests for shell enhancements with LLM and MCP built-in commands."""
 
+import asyncio
+import json
+import os
+import shlex
+from pathlib import Path
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from aishell.shell.intelligent_shell import IntelligentShell
+from aishell.llm import StreamError
+from aishell.shell.intelligent_shell import (
+    CommandHistory,
+    CommandSuggester,
+    IntelligentShell,
+    _read_alias_file,
+    _split_args,
+)
+from aishell.shell.nl_converter import MockNLConverter, NLCommandCache, OllamaNLConverter
 
 
 class TestShellEnhancements:
@@ -173,5 +187,704 @@ class TestShellEnhancements:
                 pytest.fail(f"Existing command '{cmd}' failed: {e}")
 
 
+class TestPromptAndAliasCaching:
+    """Test caching of the prompt's git branch and the alias file."""
+
+    def test_git_branch_read_from_head_without_subprocess(self, tmp_path):
+        (tmp_path / ".git").mkdir()
+        head = tmp_path / ".git" / "HEAD"
+        head.write_text("ref: refs/heads/feature/x\n")
+
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path / "sub"
+        shell.current_dir.mkdir()
+
+        with patch('aishell.shell.intelligent_shell.subprocess.run') as mock_run:
+            assert "[git:feature/x]" in shell.format_prompt()
+            mock_run.assert_not_called()
+
+        head.write_text("0123456789abcdef0123456789abcdef01234567\n")
+        stat = head.stat()
+        os.utime(head, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert "[git:0123456]" in shell.format_prompt()
+
+    def test_git_branch_cached_until_head_changes(self, tmp_path):
+        (tmp_path / ".git").mkdir()
+        head = tmp_path / ".git" / "HEAD"
+        head.write_text("ref: refs/heads/main\n")
+
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path
+
+        with patch.object(Path, 'read_text', autospec=True,
+                          side_effect=Path.read_text) as mock_read:
+            assert "[git:main]" in shell.format_prompt()
+            assert "[git:main]" in shell.format_prompt()
+            assert mock_read.call_count == 1
+
+            stat = head.stat()
+            os.utime(head, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            shell.format_prompt()
+            assert mock_read.call_count == 2
+
+    def test_missing_repository_is_cached_until_cwd_changes(self, tmp_path):
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path
+
+        with patch('aishell.shell.intelligent_shell._find_git_head',
+                   return_value=None) as mock_find:
+            assert "git:" not in shell.format_prompt()
+            assert "git:" not in shell.format_prompt()
+            assert mock_find.call_count == 1
+
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        stat = tmp_path.stat()
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert "[git:main]" in shell.format_prompt()
+
+    def test_prompt_shows_directory_relative_to_home(self, tmp_path):
+        shell = IntelligentShell(nl_provider='mock')
+        shell._home_str = str(tmp_path / "me")
+        shell._home_prefix = shell._home_str + os.sep
+
+        with patch('aishell.shell.intelligent_shell._find_git_head', return_value=None):
+            shell.current_dir = tmp_path / "me"
+            assert "~[/bold blue]" in shell.format_prompt()
+            shell.current_dir = tmp_path / "me" / "src" / "app"
+            assert "~/src/app[/bold blue]" in shell.format_prompt()
+            # A sibling sharing the name prefix is not under home
+            shell.current_dir = tmp_path / "meta"
+            assert f"{tmp_path}/meta[/bold blue]" in shell.format_prompt()
+
+    def test_ansi_prompt_rendered_once_per_prompt(self, tmp_path):
+        from rich.console import Console
+
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        terminal = Console(force_terminal=True, color_system="standard")
+
+        with patch('aishell.shell.intelligent_shell.console', terminal), \
+             patch.object(terminal, 'capture', wraps=terminal.capture) as mock_capture:
+            prompt = shell.format_prompt_ansi()
+            assert shell.format_prompt_ansi() is prompt
+            assert mock_capture.call_count == 1
+
+        # Branch is shown literally, and escape codes are marked zero-width
+        assert "[git:main]" in prompt
+        assert "\001\x1b[" in prompt and "m\002" in prompt
+        assert "\x1b" not in prompt.replace("\001\x1b[", "")
+
+    def test_alias_file_parsed_once_while_unchanged(self, tmp_path):
+        alias_file = tmp_path / "aliases.json"
+        alias_file.write_text(json.dumps({"gs": "git status"}))
+
+        with patch('aishell.shell.intelligent_shell.json.loads',
+                   wraps=json.loads) as mock_load:
+            assert _read_alias_file(alias_file) == {"gs": "git status"}
+            assert _read_alias_file(alias_file) == {"gs": "git status"}
+            assert mock_load.call_count == 1
+
+
+class TestCommandHistory:
+    """Test append-only history persistence."""
+
+    def test_add_appends_without_loading(self, tmp_path):
+        history_file = tmp_path / "history"
+        history_file.write_text("ls\npwd")  # legacy file, no final newline
+
+        history = CommandHistory(str(history_file))
+        with patch('aishell.shell.intelligent_shell.atexit.register'):
+            history.add("git status")
+            history.add("exit")
+
+        assert history._history is None
+        assert history_file.read_text() == "ls\npwd\ngit status\n"
+        assert history.history == ["ls", "pwd", "git status"]
+        history.close()
+
+    def test_compaction_trims_file(self, tmp_path):
+        history_file = tmp_path / "history"
+        history = CommandHistory(str(history_file), max_entries=3, compact_every=4)
+
+        with patch('aishell.shell.intelligent_shell.atexit.register') as mock_register:
+            for i in range(5):
+                history.add(f"echo {i}")
+
+        mock_register.assert_called_once_with(history.close)
+        # Compacted after the 4th add, then one more append
+        assert history_file.read_text().splitlines() == [
+            "echo 1", "echo 2", "echo 3", "echo 4"
+        ]
+
+        history.close()
+        assert history_file.read_text().splitlines() == ["echo 2", "echo 3", "echo 4"]
+        assert history.history == ["echo 2", "echo 3", "echo 4"]
+        assert history._fh is None
+
+
+class TestCommandSuggester:
+    """Test completion and dangerous-command detection."""
+
+    def test_check_dangerous_reports_matching_pair(self):
+        suggester = CommandSuggester()
+
+        assert "(rm -rf)" in suggester.check_dangerous("rm -rf /tmp/build")
+        assert "(chmod 777)" in suggester.check_dangerous("sudo chmod 777 file")
+        assert "(dd if=)" in suggester.check_dangerous("dd if=/dev/zero of=disk.img")
+
+    def test_check_dangerous_ignores_safe_commands(self):
+        suggester = CommandSuggester()
+
+        assert suggester.check_dangerous("ls -la") is None
+        assert suggester.check_dangerous("git status") is None
+        # 'rm' inside another word is not the rm command
+        assert suggester.check_dangerous("terraform plan -rf") is None
+
+    def test_suggest_completion_for_common_command(self):
+        suggester = CommandSuggester()
+
+        suggestions = suggester.suggest_completion("docker")
+        assert suggestions[0] == "docker ps"
+        # Callers get their own list
+        suggestions.append("docker extra")
+        assert "docker extra" not in suggester.suggest_completion("docker")
+
+    def test_complete_path_lists_matching_entries(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "setup.py").write_text("")
+        (tmp_path / "README.md").write_text("")
+        suggester = CommandSuggester()
+
+        matches = suggester._complete_path(f"{tmp_path}/s")
+
+        assert sorted(matches) == [f"{tmp_path}/setup.py", f"{tmp_path}/src/"]
+
+    def test_complete_path_stops_at_limit(self, tmp_path):
+        for i in range(25):
+            (tmp_path / f"file{i}.txt").write_text("")
+        suggester = CommandSuggester()
+
+        assert len(suggester._complete_path(f"{tmp_path}/file")) == 10
+        assert suggester._complete_path(f"{tmp_path}/missing/x") == []
+
+    def test_directory_listing_cached_until_mtime_changes(self, tmp_path):
+        (tmp_path / "alpha").mkdir()
+        (tmp_path / "beta.txt").write_text("")
+        suggester = CommandSuggester()
+
+        with patch('aishell.shell.intelligent_shell.os.scandir',
+                   wraps=os.scandir) as mock_scandir:
+            assert suggester._complete_path(f"{tmp_path}/a") == [f"{tmp_path}/alpha/"]
+            assert suggester._complete_path(f"{tmp_path}/b") == [f"{tmp_path}/beta.txt"]
+            assert mock_scandir.call_count == 1
+
+            (tmp_path / "apple").write_text("")
+            stat = tmp_path.stat()
+            os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert suggester._complete_path(f"{tmp_path}/a") == [
+                f"{tmp_path}/alpha/", f"{tmp_path}/apple"
+            ]
+            assert mock_scandir.call_count == 2
+
+    def test_suggest_completion_passes_limit_to_path_scan(self, tmp_path):
+        suggester = CommandSuggester()
+
+        with patch.object(suggester, '_complete_path', return_value=[]) as mock_complete:
+            suggester.suggest_completion(f"cat {tmp_path}/f", limit=3)
+            mock_complete.assert_called_once_with(f"{tmp_path}/f", 3)
+
+        assert suggester.suggest_completion("cat notes") == []
+
+    def test_executables_completed_from_path(self, tmp_path, monkeypatch):
+        bin_a, bin_b = tmp_path / "a", tmp_path / "b"
+        bin_a.mkdir()
+        bin_b.mkdir()
+        for name in ("gitk", "gist", "grep"):
+            (bin_a / name).write_text("")
+        (bin_b / "git").write_text("")
+        (bin_b / "gitdir").mkdir()
+        monkeypatch.setenv("PATH", f"{bin_a}{os.pathsep}{bin_b}{os.pathsep}{tmp_path}/missing")
+        suggester = CommandSuggester()
+
+        assert suggester.suggest_completion("gi") == ["gist", "git", "gitk"]
+        assert suggester._complete_executable("gi", limit=2) == ["gist", "git"]
+
+        with patch('aishell.shell.intelligent_shell.os.scandir',
+                   wraps=os.scandir) as mock_scandir:
+            suggester.suggest_completion("gr")
+            mock_scandir.assert_not_called()
+
+            (bin_b / "gradle").write_text("")
+            stat = bin_b.stat()
+            os.utime(bin_b, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert suggester.suggest_completion("gr") == ["gradle", "grep"]
+            assert mock_scandir.call_count == 2
+
+
+class TestExternalCommands:
+    """Test how external commands are spawned."""
+
+    def test_simple_command_skips_shell(self, tmp_path):
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path
+
+        process = shell._spawn('echo "hello world"', dict(os.environ))
+        stdout, _ = process.communicate()
+
+        assert process.args == ["echo", "hello world"]
+        assert stdout == "hello world\n"
+
+    def test_metacharacters_use_shell(self, tmp_path):
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path
+
+        process = shell._spawn("echo one | tr a-z A-Z", dict(os.environ))
+        stdout, _ = process.communicate()
+
+        assert process.args == "echo one | tr a-z A-Z"
+        assert stdout == "ONE\n"
+
+    def test_shell_builtin_falls_back_to_shell(self, tmp_path):
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path
+
+        process = shell._spawn("umask", dict(os.environ))
+        stdout, _ = process.communicate()
+
+        assert process.args == "umask"
+        assert process.returncode == 0
+        assert stdout.strip().isdigit()
+
+    def test_uncaptured_command_writes_to_terminal(self, tmp_path, capfd):
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path
+        capfd.readouterr()
+
+        process = shell._spawn("printf streamed", dict(os.environ), capture=False)
+        stdout, stderr = process.communicate()
+
+        assert (stdout, stderr) == (None, None)
+        assert capfd.readouterr().out == "streamed"
+
+    def test_command_env_reused_until_export(self):
+        shell = IntelligentShell(nl_provider='mock')
+
+        env = shell._command_env()
+        assert shell._command_env() is env
+
+        shell.execute_command("export AISHELL_TEST_VAR=1")
+        try:
+            new_env = shell._command_env()
+            assert new_env is not env
+            assert new_env["AISHELL_TEST_VAR"] == "1"
+        finally:
+            os.environ.pop("AISHELL_TEST_VAR", None)
+
+    def test_export_keeps_inner_quotes_and_equals(self):
+        shell = IntelligentShell(nl_provider='mock')
+
+        try:
+            assert shell.execute_command("export AISHELL_TEST_VAR='bar=baz'")[0] == 0
+            assert os.environ["AISHELL_TEST_VAR"] == "bar=baz"
+            shell.execute_command("export AISHELL_TEST_VAR=don't")
+            assert os.environ["AISHELL_TEST_VAR"] == "don't"
+        finally:
+            os.environ.pop("AISHELL_TEST_VAR", None)
+
+        assert shell.execute_command("export =x") == (1, "", "export: Invalid syntax")
+        assert shell.execute_command("export FOO") == (1, "", "export: Invalid syntax")
+
+    def test_split_args_matches_shlex(self):
+        for line in ['env show API', '  env  set KEY\tvalue ', 'env set KEY "a b"',
+                     "generate python 'two words'", r'llm a\ b', 'collate a b "x"y']:
+            assert _split_args(line) == shlex.split(line)
+
+        with patch('aishell.shell.intelligent_shell.shlex.split') as mock_split:
+            _split_args('env show API')
+            mock_split.assert_not_called()
+
+    def test_builtin_dispatch(self, tmp_path):
+        shell = IntelligentShell(nl_provider='mock')
+        shell.current_dir = tmp_path
+
+        assert shell.execute_command("pwd") == (0, str(tmp_path), "")
+        with patch.object(shell, '_handle_env', return_value=(0, "", "")) as mock_env, \
+             patch.object(shell, '_handle_llm', return_value=(0, "", "")) as mock_llm, \
+             patch.object(shell, '_spawn') as mock_spawn:
+            mock_spawn.return_value.communicate.return_value = ("", "")
+            mock_spawn.return_value.returncode = 0
+
+            shell.execute_command("env list")
+            mock_env.assert_called_once_with("env list")
+
+            # Prefix of a built-in, but a different program
+            shell.execute_command("envsubst")
+            assert mock_spawn.call_args[0][0] == "envsubst"
+
+            shell.execute_command("what time is it")
+            mock_llm.assert_called_once_with('llm "what time is it"')
+
+    def test_cd_parses_plain_and_quoted_paths(self, tmp_path):
+        (tmp_path / "plain").mkdir()
+        (tmp_path / "with space").mkdir()
+        shell = IntelligentShell(nl_provider='mock')
+        cwd = os.getcwd()
+
+        try:
+            with patch('aishell.shell.intelligent_shell.shlex.split',
+                       wraps=shlex.split) as mock_split:
+                assert shell._handle_cd(f"cd {tmp_path}/plain")[0] == 0
+                mock_split.assert_not_called()
+
+                assert shell._handle_cd(f'cd "{tmp_path}/with space"')[0] == 0
+                assert shell.current_dir == (tmp_path / "with space").resolve()
+                assert shell._handle_cd(f"cd {tmp_path}/with\\ space")[0] == 0
+                assert mock_split.call_count == 2
+
+            assert shell._handle_cd("cd 'unbalanced")[0] == 1
+            assert shell._handle_cd("cd")[1] == str(Path.home().resolve())
+        finally:
+            os.chdir(cwd)
+
+
+class TestAsyncCommands:
+    """Test the shared event loop and provider reuse."""
+
+    @patch('aishell.shell.intelligent_shell.ClaudeLLMProvider')
+    def test_llm_queries_share_loop_and_provider(self, mock_claude_provider):
+        loops = []
+
+        async def query(*args, **kwargs):
+            loops.append(asyncio.get_running_loop())
+            return MagicMock(is_error=False, content="ok", model="m", usage=None, metadata=None)
+
+        mock_claude_provider.return_value.query = query
+        shell = IntelligentShell(nl_provider='mock')
+
+        with patch('aishell.shell.intelligent_shell.atexit.register'):
+            assert shell.execute_command('llm claude "one"')[0] == 0
+            assert shell.execute_command('llm claude "two"')[0] == 0
+
+        assert mock_claude_provider.call_count == 1
+        assert loops[0] is loops[1] is shell._loop
+
+        shell.close()
+        assert shell._loop.is_closed()
+
+    @patch('aishell.shell.intelligent_shell.get_transcript_manager')
+    @patch('aishell.shell.intelligent_shell.Live')
+    @patch('aishell.shell.intelligent_shell.ClaudeLLMProvider')
+    @patch('aishell.shell.intelligent_shell.OpenAILLMProvider')
+    def test_collate_rows_added_as_providers_finish(
+        self, mock_openai, mock_claude, mock_live, mock_transcript
+    ):
+        def provider(delay, content):
+            async def query(*args, **kwargs):
+                await asyncio.sleep(delay)
+                return MagicMock(is_error=False, content=content, usage=None)
+            return MagicMock(query=query, default_model="m")
+
+        mock_claude.return_value = provider(0.05, "slow")
+        mock_openai.return_value = provider(0, "fast")
+        shell = IntelligentShell(nl_provider='mock')
+
+        with patch('aishell.shell.intelligent_shell.atexit.register'):
+            result = shell.execute_command('collate claude openai "q" --no-save')
+        assert result == (0, "", "")
+
+        table = mock_live.call_args.args[0]
+        assert table.columns[0]._cells == ["Openai", "Claude"]
+        assert table.caption is None
+        logged = mock_transcript.return_value.log_multi_interaction.call_args.args[1]
+        assert [name for name, _ in logged] == ["claude", "openai"]
+        shell.close()
+
+    @patch('aishell.shell.intelligent_shell.Live')
+    @patch('aishell.shell.intelligent_shell.ClaudeLLMProvider')
+    def test_generate_streams_code_into_live_panel(self, mock_claude, mock_live):
+        async def stream_query(prompt, **kwargs):
+            for chunk in ["def f():\n", "    return 1\n"]:
+                yield chunk
+
+        mock_claude.return_value = MagicMock(stream_query=stream_query)
+        live = mock_live.return_value.__enter__.return_value
+        shell = IntelligentShell(nl_provider='mock')
+
+        with patch('aishell.shell.intelligent_shell.atexit.register'), \
+             patch('aishell.shell.intelligent_shell.console') as mock_console:
+            assert shell.execute_command('generate python "a function"') == (0, "", "")
+
+        assert live.update.call_count == 2
+        final = mock_console.print.call_args.args[0]
+        assert final.renderable.code == "def f():\n    return 1\n"
+        shell.close()
+
+    @patch('aishell.shell.intelligent_shell.Live')
+    @patch('aishell.shell.intelligent_shell.ClaudeLLMProvider')
+    def test_generate_reports_stream_error(self, mock_claude, mock_live):
+        async def stream_query(prompt, **kwargs):
+            yield StreamError("API key not configured")
+
+        mock_claude.return_value = MagicMock(stream_query=stream_query)
+        shell = IntelligentShell(nl_provider='mock')
+
+        with patch('aishell.shell.intelligent_shell.atexit.register'), \
+             patch('aishell.shell.intelligent_shell.console') as mock_console:
+            shell.execute_command('generate python "a function"')
+
+        mock_console.print.assert_called_once_with(
+            "[red]Generation failed:[/red] API key not configured"
+        )
+        shell.close()
+
+    @patch('aishell.shell.intelligent_shell.Live')
+    @patch('aishell.shell.intelligent_shell.ClaudeLLMProvider')
+    def test_generate_reports_error_after_partial_output(self, mock_claude, mock_live):
+        async def stream_query(prompt, **kwargs):
+            yield "def f():\n"
+            yield StreamError("Claude API error: overloaded")
+
+        mock_claude.return_value = MagicMock(stream_query=stream_query)
+        shell = IntelligentShell(nl_provider='mock')
+
+        with patch('aishell.shell.intelligent_shell.atexit.register'), \
+             patch('aishell.shell.intelligent_shell.console') as mock_console:
+            shell.execute_command('generate python "a function"')
+
+        mock_console.print.assert_called_once_with(
+            "[red]Generation failed:[/red] Claude API error: overloaded"
+        )
+        shell.close()
+
+    @patch('aishell.shell.intelligent_shell.Live')
+    @patch('aishell.shell.intelligent_shell.ClaudeLLMProvider')
+    def test_generate_keeps_code_that_mentions_errors(self, mock_claude, mock_live):
+        async def stream_query(prompt, **kwargs):
+            yield "print('x')\n"
+            yield "Error: not a failure\n"
+
+        mock_claude.return_value = MagicMock(stream_query=stream_query)
+        shell = IntelligentShell(nl_provider='mock')
+
+        with patch('aishell.shell.intelligent_shell.atexit.register'), \
+             patch('aishell.shell.intelligent_shell.console') as mock_console:
+            shell.execute_command('generate python "a function"')
+
+        final = mock_console.print.call_args.args[0]
+        assert final.renderable.code == "print('x')\nError: not a failure\n"
+        shell.close()
+
+    def test_interrupt_cancels_pending_tasks(self):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def command():
+            def interrupt():
+                raise KeyboardInterrupt
+
+            asyncio.get_running_loop().call_later(0.01, interrupt)
+            await asyncio.gather(slow(), slow())
+
+        shell = IntelligentShell(nl_provider='mock')
+        with patch('aishell.shell.intelligent_shell.atexit.register'):
+            with pytest.raises(KeyboardInterrupt):
+                shell._run_async(command())
+
+        assert cancelled == [True, True]
+        assert not asyncio.all_tasks(shell._loop)
+        shell.close()
+
+    @patch('aishell.shell.intelligent_shell.ClaudeLLMProvider')
+    def test_config_change_rebuilds_providers(self, mock_claude_provider, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "key-1")
+        shell = IntelligentShell(nl_provider='mock')
+
+        first = shell._get_provider("claude")
+        shell.execute_command("export AISHELL_TEST_VAR=1")
+        try:
+            assert shell._get_provider("claude") is first
+        finally:
+            os.environ.pop("AISHELL_TEST_VAR", None)
+        assert mock_claude_provider.call_count == 1
+
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "key-2")
+        shell._get_provider("claude")
+        assert mock_claude_provider.call_count == 2
+        assert mock_claude_provider.call_args.kwargs["api_key"] == "key-2"
+
+
+def test_shell_import_skips_heavy_sdks():
+    """Importing the shell must not pull in aiohttp or the Anthropic SDK."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, aishell.shell.intelligent_shell; "
+        "print(sorted(m for m in ('aiohttp', 'anthropic', 'rich.syntax') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+class TestAliasExpansion:
+    """Test alias expansion."""
+
+    def test_expands_first_word_only(self):
+        shell = IntelligentShell(nl_provider='mock')
+
+        assert shell.expand_alias("ll") == "ls -la"
+        assert shell.expand_alias("g status") == "git status"
+        assert shell.expand_alias("git ll") == "git ll"
+
+    def test_keeps_arguments_verbatim(self):
+        shell = IntelligentShell(nl_provider='mock')
+
+        assert shell.expand_alias('ll "my dir"') == 'ls -la "my dir"'
+        # Unbalanced quotes are left for the shell to report
+        assert shell.expand_alias("echo 'oops") == "echo 'oops"
+
+    def test_alias_listing_is_sorted_and_cached(self):
+        shell = IntelligentShell(nl_provider='mock')
+
+        listing = shell._alias_listing()
+        assert listing == sorted(shell.aliases.items())
+        assert shell._alias_listing() is listing
+
+        shell.aliases = {"zz": "ls", "aa": "pwd"}
+        assert shell._show_aliases() == (0, "aa='pwd'\nzz='ls'", "")
+
+    def test_help_screen_built_once(self):
+        shell = IntelligentShell(nl_provider='mock')
+
+        with patch('aishell.shell.intelligent_shell.console') as mock_console, \
+             patch.object(shell, '_build_help', wraps=shell._build_help) as mock_build:
+            shell._show_help()
+            shell._show_help()
+            assert mock_build.call_count == 1
+            assert mock_console.print.call_count == 2
+
+            shell.aliases = {"x": "exit"}
+            shell._show_help()
+            assert mock_build.call_count == 2
+
+
+class TestNLCommandCache:
+    """Test memoization of natural language conversions."""
+
+    def test_case_spacing_and_punctuation_are_ignored(self):
+        cache = NLCommandCache()
+        cache.put("Show me the disk usage", "Linux", "df -h")
+
+        assert cache.get("  show me THE disk usage ", "Linux") == "df -h"
+        assert cache.get("Show me the disk usage?", "Linux") == "df -h"
+        assert cache.get("show me the disk usage", "Darwin") is None
+        assert cache.get("show disk usage", "Linux") is None
+
+    def test_different_operands_do_not_collide(self):
+        cache = NLCommandCache()
+        cache.put("delete file a", "Linux", "rm a")
+        cache.put("copy notes.txt to backup.txt", "Linux", "cp notes.txt backup.txt")
+
+        assert cache.get("delete file a.", "Linux") == "rm a"
+        assert cache.get("delete file i", "Linux") is None
+        assert cache.get("delete file", "Linux") is None
+        assert cache.get("copy backup.txt to notes.txt", "Linux") is None
+        assert cache.get("copy notes.txt backup.txt", "Linux") is None
+        assert cache.get("copy the backup.txt", "Linux") is None
+        assert cache.get("copy notes.txt,backup.txt", "Linux") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = NLCommandCache(max_entries=2)
+        cache.put("list files", "Linux", "ls -la")
+        cache.put("disk usage", "Linux", "df -h")
+        cache.get("list files", "Linux")
+        cache.put("running processes", "Linux", "ps aux")
+
+        assert cache.get("disk usage", "Linux") is None
+        assert cache.get("List files!", "Linux") == "ls -la"
+
+    def test_persists_to_file(self, tmp_path):
+        cache_file = tmp_path / "nl_cache.json"
+        with patch("aishell.shell.nl_converter.atexit.register"):
+            cache = NLCommandCache(str(cache_file))
+            cache.put("list files", "Linux", "ls -la")
+            cache.save()
+
+        assert NLCommandCache(str(cache_file)).get("List files.", "Linux") == "ls -la"
+
+    def test_shell_skips_converter_on_repeat(self):
+        shell = IntelligentShell(nl_provider='mock')
+        shell._nl_cache = NLCommandCache()
+        shell.nl_converter = MagicMock()
+        shell.nl_converter.convert.return_value = "pwd"
+
+        with patch('aishell.shell.intelligent_shell.Prompt.ask', return_value="y"), \
+             patch.object(shell, 'execute_command', return_value=(0, "", "")), \
+             patch.object(shell.history, 'add'):
+            shell._process_nl_command("current directory")
+            shell._process_nl_command("Current directory?")
+
+        shell.nl_converter.convert.assert_called_once()
+
+    def test_declined_command_is_not_cached(self):
+        shell = IntelligentShell(nl_provider='mock')
+        shell._nl_cache = NLCommandCache()
+
+        with patch('aishell.shell.intelligent_shell.Prompt.ask', return_value="n"):
+            shell._process_nl_command("list files")
+
+        assert shell._nl_cache.get("list files", "Linux") is None
+
+
+class TestMockNLConverter:
+    """Test the mock converter's phrase matching."""
+
+    def test_earlier_phrases_take_priority(self):
+        converter = MockNLConverter()
+
+        assert converter.convert("find the current directory", {}) == "pwd"
+        assert converter.convert("show files and list files", {}) == "ls -la"
+        assert converter.convert("Disk Usage", {}) == "df -h"
+        assert converter.convert("hello", {}) is None
+
+    def test_arguments_taken_from_original_input(self):
+        converter = MockNLConverter()
+
+        assert converter.convert("find report.PDF", {}) == "find . -name '*report.PDF*'"
+        assert converter.convert("search for TODO", {}) == "grep -r 'TODO' ."
+        assert converter.convert("create directory build", {}) == "mkdir build"
+
+
+class TestOllamaNLConverter:
+    """Test the Ollama converter's HTTP usage."""
+
+    def test_conversions_share_one_session(self):
+        converter = OllamaNLConverter(timeout=5)
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"response": "ls -la\nlists files"}
+
+        with patch.object(converter.session, 'post', return_value=response) as mock_post:
+            assert converter.convert("list files", {}) == "ls -la"
+            assert converter.convert("list files", {}) == "ls -la"
+
+        assert mock_post.call_count == 2
+        assert mock_post.call_args.kwargs["timeout"] == 5
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""Tests for web search helpers that don't need a live browser."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aishell.search.web_search import (
+    BrowserPool,
+    SearchResultCache,
+    get_search_cache,
+    WebSearcher,
+    _is_blocked_request,
+    _parse_hackernews,
+    _route_request,
+    display_results,
+)
+
+
+class TestSearchAll:
+    """Test concurrent multi-engine search."""
+
+    @pytest.mark.asyncio
+    async def test_search_all_merges_and_dedupes(self):
+        searcher = WebSearcher(cache=SearchResultCache())
+        google = [{"title": "A", "url": "https://a", "snippet": ""}]
+        ddg = [
+            {"title": "A again", "url": "https://a", "snippet": ""},
+            {"title": "B", "url": "https://b", "snippet": ""},
+        ]
+        hn = [{"title": "C", "url": "https://c", "snippet": ""}]
+
+        with patch.object(searcher, "search_google", AsyncMock(return_value=google)), \
+             patch.object(searcher, "search_duckduckgo", AsyncMock(return_value=ddg)), \
+             patch.object(searcher, "search_hackernews", AsyncMock(return_value=hn)):
+            results = await searcher.search_all("query", limit=5)
+
+        assert [r["url"] for r in results] == ["https://a", "https://b", "https://c"]
+        assert results[0]["title"] == "A"
+
+    @pytest.mark.asyncio
+    async def test_search_all_survives_engine_failure(self):
+        searcher = WebSearcher(cache=SearchResultCache())
+        ddg = [{"title": "B", "url": "https://b", "snippet": ""}]
+
+        with patch.object(searcher, "search_google", AsyncMock(side_effect=RuntimeError("blocked"))), \
+             patch.object(searcher, "search_duckduckgo", AsyncMock(return_value=ddg)), \
+             patch.object(searcher, "search_hackernews", AsyncMock(return_value=[])):
+            results = await searcher.search_all("query")
+
+        assert results == ddg
+
+
+class TestSearchResultCache:
+    """Test the per-query result cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_is_served_from_cache(self):
+        cache = SearchResultCache()
+        searcher = WebSearcher(cache=cache)
+        results = [{"title": "A", "url": "https://a", "snippet": ""}]
+        fetch = AsyncMock(return_value=results)
+
+        with patch.object(searcher, "_search_google", fetch):
+            first = await searcher.search_google("query", 5)
+            second = await searcher.search_google("query", 5)
+            await searcher.search_google("query", 10)
+
+        assert first == second == results
+        assert fetch.await_count == 2  # different limit is a different key
+
+    @pytest.mark.asyncio
+    async def test_empty_results_are_not_cached(self):
+        searcher = WebSearcher(cache=SearchResultCache())
+        fetch = AsyncMock(return_value=[])
+
+        with patch.object(searcher, "_search_duckduckgo", fetch):
+            await searcher.search_duckduckgo("query")
+            await searcher.search_duckduckgo("query")
+
+        assert fetch.await_count == 2
+
+    def test_entries_expire_and_evict(self):
+        cache = SearchResultCache(ttl=60, max_entries=2)
+        row = [{"title": "A", "url": "https://a", "snippet": ""}]
+
+        with patch("aishell.search.web_search.time.time", return_value=1000.0):
+            cache.put("google", "one", 10, row)
+            cache.put("google", "two", 10, row)
+            cache.get("google", "one", 10)
+            cache.put("google", "three", 10, row)
+
+            assert cache.get("google", "two", 10) is None  # least recently used
+            assert cache.get("google", "one", 10) == row
+
+        with patch("aishell.search.web_search.time.time", return_value=1061.0):
+            assert cache.get("google", "one", 10) is None
+
+    def test_cache_persists_to_file(self):
+        row = [{"title": "A", "url": "https://a", "snippet": ""}]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_file = Path(tmpdir) / "cache.json"
+
+            with patch("aishell.search.web_search.atexit.register"):
+                cache = SearchResultCache(str(cache_file))
+                cache.put("hackernews", "query", 10, row)
+                cache.save()
+
+            reloaded = SearchResultCache(str(cache_file))
+            assert reloaded.get("hackernews", "query", 10) == row
+
+    def test_shared_cache_is_in_memory_unless_configured(self, monkeypatch, tmp_path):
+        get_search_cache.cache_clear()
+        monkeypatch.delenv("AISHELL_SEARCH_CACHE_FILE", raising=False)
+        assert get_search_cache().cache_file is None
+
+        get_search_cache.cache_clear()
+        monkeypatch.setenv("AISHELL_SEARCH_CACHE_FILE", str(tmp_path / "cache.json"))
+        assert get_search_cache().cache_file == tmp_path / "cache.json"
+        get_search_cache.cache_clear()
+
+
+class TestBrowserPool:
+    """Test browser sharing and per-search contexts."""
+
+    @pytest.mark.asyncio
+    async def test_contexts_are_fresh_and_the_browser_is_shared(self):
+        browser = MagicMock(is_connected=MagicMock(return_value=True), close=AsyncMock())
+        browser.new_context = AsyncMock(side_effect=lambda **kwargs: AsyncMock())
+        playwright = MagicMock(stop=AsyncMock())
+        playwright.chromium.launch = AsyncMock(return_value=browser)
+        driver = MagicMock(start=AsyncMock(return_value=playwright))
+        pool = BrowserPool()
+
+        with patch("playwright.async_api.async_playwright", return_value=driver), \
+             patch("aishell.search.web_search._get_stealth", return_value=None):
+            first = await pool.acquire()
+            await pool.release(first)
+            second = await pool.acquire()
+            await pool.release(second)
+            await pool.close()
+
+        assert second is not first
+        first.close.assert_awaited_once()
+        playwright.chromium.launch.assert_awaited_once()
+        browser.close.assert_awaited_once()
+        playwright.stop.assert_awaited_once()
+
+
+def test_display_results_prints_once():
+    results = [
+        {"title": "First", "url": "https://a", "snippet": "one"},
+        {"title": "Second", "url": "https://b", "snippet": "two"},
+    ]
+
+    with patch("aishell.search.web_search.console") as mock_console:
+        display_results(results, "query")
+
+    mock_console.print.assert_called_once()
+
+
+def test_parse_hackernews_extracts_stories():
+    story = (
+        '<div class="Story Story_container">'
+        '<div class="Story_title"><a href="{url}"><span>{title}</span></a></div>'
+        '<div class="Story_meta"><span>120 points</span> <span> by pg </span></div>'
+        '</div>'
+    )
+    content = "<html><body>{}{}{}<div class='Story_container'></div></body></html>".format(
+        story.format(url="https://a", title="First"),
+        story.format(url="https://b", title="Second"),
+        story.format(url="https://c", title="Third"),
+    )
+
+    results = _parse_hackernews(content, limit=2)
+
+    assert results == [
+        {"title": "First", "url": "https://a", "snippet": "120 pointsby pg"},
+        {"title": "Second", "url": "https://b", "snippet": "120 pointsby pg"},
+    ]
+    assert _parse_hackernews(content, limit=10)[-1]["title"] == "Third"
+
+
+def test_heavy_and_tracking_requests_are_blocked():
+    assert _is_blocked_request("image", "https://www.google.com/logo.png")
+    assert _is_blocked_request("stylesheet", "https://duckduckgo.com/s.css")
+    assert _is_blocked_request("script", "https://www.googletagmanager.com/gtm.js")
+    assert _is_blocked_request("xhr", "https://stats.g.doubleclick.net/collect")
+    assert not _is_blocked_request("document", "https://www.google.com/search?q=x")
+    assert not _is_blocked_request("script", "https://notdoubleclick.net/app.js")
+
+
+@pytest.mark.asyncio
+async def test_route_request_aborts_or_continues():
+    blocked = AsyncMock()
+    blocked.request = MagicMock(resource_type="font", url="https://a/font.woff2")
+    allowed = AsyncMock()
+    allowed.request = MagicMock(resource_type="xhr", url="https://hn.algolia.com/api")
+
+    await _route_request(blocked)
+    await _route_request(allowed)
+
+    blocked.abort.assert_awaited_once()
+    blocked.continue_.assert_not_awaited()
+    allowed.continue_.assert_awaited_once()
@@ -0,0 +1,23 @@
+"""Tests for event loop selection."""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+from aishell.utils.event_loop import install_uvloop
+
+
+def test_install_uvloop_sets_policy_when_available():
+    fake_uvloop = MagicMock()
+    with patch.dict(sys.modules, {"uvloop": fake_uvloop}), \
+         patch("aishell.utils.event_loop.asyncio.set_event_loop_policy") as mock_set:
+        assert install_uvloop() is True
+
+    mock_set.assert_called_once_with(fake_uvloop.EventLoopPolicy.return_value)
+
+
+def test_install_uvloop_is_noop_when_missing():
+    with patch.dict(sys.modules, {"uvloop": None}), \
+         patch("aishell.utils.event_loop.asyncio.set_event_loop_policy") as mock_set:
+        assert install_uvloop() is False
+
+    mock_set.assert_not_called()
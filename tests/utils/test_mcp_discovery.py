@@ -86,6 +86,53 @@ class TestMCPCapabilityManager:
         assert "mcp github" in context
         assert "USAGE INSTRUCTIONS:" in context
     
+    @patch('aishell.utils.mcp_discovery.get_env_manager')
+    def test_generate_mcp_context_prompt_section_layout(self, mock_get_env_manager):
+        """Test that a server section wraps its command line."""
+        mock_env_manager = Mock()
+        mock_env_manager.get_mcp_servers.return_value = {'sqlite': 'uvx mcp-server-sqlite'}
+        mock_get_env_manager.return_value = mock_env_manager
+        
+        context = MCPCapabilityManager().generate_mcp_context_prompt()
+        
+        assert (
+            "servers that extend your capabilities:\n\n"
+            "## SQLITE - SQLite local database file operations\n"
+            "Command: uvx mcp-server-sqlite\n"
+            "\nCapabilities:\n  • Query local SQLite databases\n"
+        ) in context
+        assert (
+            '  mcp sqlite "PRAGMA table_info(products)"\n\n---\n\n\nUSAGE INSTRUCTIONS:\n'
+        ) in context
+        assert context.endswith("suggest 'mcp jira' commands\n")
+    
+    @patch('aishell.utils.mcp_discovery.get_env_manager')
+    def test_generate_mcp_context_prompt_cached_per_server_set(self, mock_get_env_manager):
+        """Test that the prompt is rebuilt only when the servers change."""
+        mock_env_manager = Mock()
+        mock_env_manager.get_mcp_servers.return_value = {
+            'postgres': 'npx @modelcontextprotocol/server-postgres'
+        }
+        mock_get_env_manager.return_value = mock_env_manager
+        
+        manager = MCPCapabilityManager()
+        with patch.object(manager, '_build_context_prompt',
+                          wraps=manager._build_context_prompt) as mock_build:
+            first = manager.generate_mcp_context_prompt()
+            assert manager.generate_mcp_context_prompt() is first
+            assert mock_build.call_count == 1
+            
+            mock_env_manager.get_mcp_servers.return_value = {}
+            assert manager.generate_mcp_context_prompt() == "No MCP servers are currently configured."
+            assert mock_build.call_count == 2
+            
+            # Switching back to an earlier server set is still cached
+            mock_env_manager.get_mcp_servers.return_value = {
+                'postgres': 'npx @modelcontextprotocol/server-postgres'
+            }
+            assert manager.generate_mcp_context_prompt() is first
+            assert mock_build.call_count == 2
+    
     @patch('aishell.utils.mcp_discovery.get_env_manager')
     def test_get_capability_summary(self, mock_get_env_manager):
         """Test getting capability summary."""
@@ -113,4 +160,29 @@ def test_get_mcp_capability_manager():
     manager2 = get_mcp_capability_manager()
     
     assert manager1 is manager2  # Should be the same instance
-    assert isinstance(manager1, MCPCapabilityManager)
\ No newline at end of file
+    assert isinstance(manager1, MCPCapabilityManager)
+
+
+def test_server_capabilities_are_shared_and_read_only():
+    """Test that capability data is a single immutable table."""
+    first = MCPCapabilityManager()
+    second = MCPCapabilityManager()
+    
+    assert first.server_capabilities is second.server_capabilities
+    assert isinstance(first.server_capabilities['postgres']['capabilities'], tuple)
+    with pytest.raises(TypeError):
+        first.server_capabilities['custom'] = {}
+    
+    # Callers still get plain, mutable copies
+    capabilities = first.get_server_capabilities('postgres')
+    assert isinstance(capabilities['capabilities'], list)
+    capabilities['capabilities'].append('extra')
+    assert 'extra' not in second.get_server_capabilities('postgres')['capabilities']
+
+
+def test_get_mcp_capability_manager_cache_clear():
+    """Test that clearing the accessor cache creates a fresh manager."""
+    manager = get_mcp_capability_manager()
+    get_mcp_capability_manager.cache_clear()
+    
+    assert get_mcp_capability_manager() is not manager
@@ -0,0 +1,42 @@
+"""Tests for buffered stream output."""
+
+from unittest.mock import MagicMock
+
+from rich.markdown import Markdown
+from rich.text import Text
+
+from aishell.utils.stream_output import StreamPrinter, response_renderable
+
+
+def test_chunks_are_batched_until_newline_or_size():
+    console = MagicMock()
+    printer = StreamPrinter(console, flush_at=8)
+
+    printer.write("ab")
+    printer.write("cd")
+    assert console.print.call_count == 0
+
+    printer.write("e\n")
+    printer.write("fghij")
+    printer.write("klm")
+    printer.write("[n]")
+    printer.flush()
+
+    printed = [c.args[0] for c in console.print.call_args_list]
+    assert printed == ["abcde\n", "fghijklm", "[n]"]
+    assert all(c.kwargs == {"end": "", "markup": False} for c in console.print.call_args_list)
+    assert printer.text == "abcde\nfghijklm[n]"
+
+
+def test_flush_without_pending_text_prints_nothing():
+    console = MagicMock()
+    StreamPrinter(console).flush()
+    console.print.assert_not_called()
+
+
+def test_response_renderable_only_uses_markdown_for_code_blocks():
+    plain = response_renderable("use [red] literally")
+    assert isinstance(plain, Text)
+    assert plain.plain == "use [red] literally"
+
+    assert isinstance(response_renderable("```python\nx = 1\n```"), Markdown)
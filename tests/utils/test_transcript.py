@@ -0,0 +1,169 @@
+"""Tests for LLM transcript logging."""
+
+import re
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from aishell.llm import LLMResponse
+from aishell.utils.transcript import (
+    LLMTranscriptManager,
+    _now_str,
+    get_transcript_manager,
+)
+
+_TIMESTAMP_RE = re.compile(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d")
+
+
+def _entries(manager, path):
+    """Return what was logged after the file header, with timestamps masked."""
+    manager.flush()
+    text = path.read_text(encoding="utf-8")
+    return _TIMESTAMP_RE.sub("TS", text.split("---\n\n", 1)[1])
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = LLMTranscriptManager(
+        transcript_file=str(tmp_path / "LLMTranscript.md"),
+        error_file=str(tmp_path / "LLMErrors.md"),
+    )
+    yield manager
+    manager.close()
+
+
+class TestLLMTranscriptManager:
+    """Test the transcript entry layout."""
+
+    def test_files_get_headers(self, manager):
+        assert manager.transcript_file.read_text().startswith("# LLM Interaction Transcript")
+        assert manager.error_file.read_text().startswith("# LLM Error Log")
+
+    def test_log_interaction(self, manager):
+        manager.log_interaction("q1", "resp", "claude", "m1", {"in": 1, "out": 2})
+        manager.log_interaction("q2", "plain", "ollama")
+
+        assert _entries(manager, manager.transcript_file) == (
+            "**TS | CLAUDE (m1)**\n\n**Query:** q1\n\n**Response:**\nresp\n\n"
+            "**Usage:** in: 1, out: 2\n\n---\n"
+            "**TS | OLLAMA**\n\n**Query:** q2\n\n**Response:**\nplain\n\n---\n"
+        )
+
+    def test_log_interaction_error(self, manager):
+        manager.log_interaction("q", "", "openai", error="boom")
+
+        assert _entries(manager, manager.transcript_file) == (
+            "**TS | OPENAI**\n\n**Query:** q\n\n"
+            "**Response:** Failed (see log with timestamp TS)\n\n---\n"
+        )
+        assert _entries(manager, manager.error_file) == (
+            "**TS | OPENAI**\n\n**Query:** q\n\n**Error:** boom\n\n---\n"
+        )
+
+    def test_log_multi_interaction(self, manager):
+        responses = [
+            ("claude", SimpleNamespace(is_error=False, content="c", usage={"t": 3}, model="x")),
+            ("gemini", SimpleNamespace(is_error=True, error="bad", model="g")),
+            ("ollama", "plain"),
+        ]
+        manager.log_multi_interaction("q", responses, timestamp="2024-01-02 03:04:05")
+
+        assert _entries(manager, manager.transcript_file) == (
+            "**TS | COLLATION (claude, gemini, ollama)**\n\n**Query:** q\n\n"
+            "**Responses:**\n\n"
+            "### CLAUDE\n\nc\n\n*Usage: t: 3*\n\n"
+            "### GEMINI\n\nFailed (see log with timestamp TS)\n\n"
+            "### OLLAMA\n\nplain\n\n---\n"
+        )
+        assert _entries(manager, manager.error_file) == (
+            "**TS | GEMINI (g)**\n\n**Query:** q\n\n**Error:** bad\n\n---\n"
+        )
+
+    def test_log_multi_interaction_with_llm_responses(self, manager):
+        responses = [
+            ("claude", LLMResponse(content="ok", model="m", provider="claude")),
+            ("openai", LLMResponse(content="", model="g", provider="openai", error="bad")),
+        ]
+        manager.log_multi_interaction("q", responses)
+
+        logged = _entries(manager, manager.transcript_file)
+        assert "### CLAUDE\n\nok\n\n### OPENAI\n\nFailed" in logged
+        assert "**TS | OPENAI (g)**" in _entries(manager, manager.error_file)
+
+    def test_concurrent_entries_do_not_interleave(self, manager):
+        def log(n):
+            for i in range(20):
+                manager.log_interaction(f"q{n}-{i}", "r" * 200, "claude")
+
+        threads = [threading.Thread(target=log, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        entry = "**TS | CLAUDE**\n\n**Query:** q{}\n\n**Response:**\n" + "r" * 200 + "\n\n---\n"
+        logged = _entries(manager, manager.transcript_file)
+        assert len(logged) == sum(len(entry.format(f"{n}-{i}")) for n in range(8) for i in range(20))
+        for n in range(8):
+            for i in range(20):
+                assert entry.format(f"{n}-{i}") in logged
+
+    def test_large_entry_is_written_whole(self, manager):
+        response = "x" * 100_000
+        manager.log_interaction("q", response, "claude")
+
+        assert response in _entries(manager, manager.transcript_file)
+
+    def test_lone_surrogate_does_not_stop_the_writer(self, manager):
+        manager.log_interaction("q1", "bad \ud800 text", "claude")
+        manager.log_interaction("q2", "after", "claude")
+
+        logged = _entries(manager, manager.transcript_file)
+        assert "bad ? text" in logged
+        assert "**Query:** q2" in logged
+        assert manager._writer.is_alive()
+
+    def test_close_writes_pending_entries(self, tmp_path):
+        manager = LLMTranscriptManager(
+            transcript_file=str(tmp_path / "t.md"), error_file=str(tmp_path / "e.md")
+        )
+        manager.log_interaction("q", "last words", "claude")
+        manager.close()
+
+        assert not manager._writer.is_alive()
+        assert "last words" in (tmp_path / "t.md").read_text()
+
+    def test_entries_logged_after_close_are_written(self, tmp_path):
+        manager = LLMTranscriptManager(
+            transcript_file=str(tmp_path / "t.md"), error_file=str(tmp_path / "e.md")
+        )
+        manager.close()
+        manager.log_interaction("q", "late", "claude", error="boom")
+        manager.flush()
+        manager.close()
+
+        assert "**Query:** q" in (tmp_path / "t.md").read_text()
+        assert "**Error:** boom" in (tmp_path / "e.md").read_text()
+
+
+def test_now_str_is_formatted_once_per_second():
+    with patch("aishell.utils.transcript.time.time", return_value=1_700_000_000.25), \
+         patch("aishell.utils.transcript.datetime", wraps=datetime) as mock_datetime:
+        first = _now_str()
+        assert _now_str() is first
+        assert mock_datetime.fromtimestamp.call_count == 1
+
+    assert first == datetime.fromtimestamp(1_700_000_000).strftime("%Y-%m-%d %H:%M:%S")
+
+    with patch("aishell.utils.transcript.time.time", return_value=1_700_000_001.0):
+        assert _now_str() != first
+
+
+def test_global_manager_writes_under_outputs_dir(tmp_path):
+    manager = get_transcript_manager()
+
+    assert get_transcript_manager() is manager
+    assert manager.transcript_file == (tmp_path / "outputs" / "LLMTranscript.md").resolve()